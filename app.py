@@ -1,9 +1,13 @@
 import os
-from fastapi import FastAPI, HTTPException
+import json
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, List, Tuple
-from main import extract_weak_areas, search_youtube_videos, generate_video_recommendations
+from typing import Dict, List, Optional, Tuple
+from main import (extract_weak_areas_async, search_youtube_videos_async, generate_video_recommendations_async,
+                  aiter_video_recommendations, format_stream_event, generate_batch_recommendations_async,
+                  MAX_BATCH_REPORTS, quota_scheduler, get_semantic_cache, request_deadline_ms, STARTUP_METRICS)
 
 app = FastAPI(title="Skill Improvement Video Recommender",
              description="API to get YouTube video recommendations based on skill assessment reports")
@@ -19,20 +23,51 @@ app.add_middleware(
 
 class ReportRequest(BaseModel):
     report_text: str
+    enrich: Optional[bool] = None
+    deadline_ms: Optional[int] = None
 
 class VideoRecommendation(BaseModel):
     skill: str
     videos: List[Dict[str, str]]
 
+class BatchReportRequest(BaseModel):
+    report_texts: List[str]
+    enrich: Optional[bool] = None
+
+class BatchRecommendationResult(BaseModel):
+    index: int
+    status: str
+    recommendations: List[VideoRecommendation] = []
+    message: Optional[str] = None
+
 @app.get("/")
 async def read_root():
     return {"message": "Welcome to the Skill Improvement Video Recommender API"}
 
+@app.get("/health")
+async def health_check():
+    semantic_cache = get_semantic_cache()
+    return {"status": "healthy", "service": "youtube-recommendations", "startup": STARTUP_METRICS,
+            "semantic_cache": semantic_cache.metrics() if semantic_cache is not None else None}
+
+@app.get("/quota")
+async def quota_status():
+    """Report YouTube quota spend, remaining budget and the current degradation level."""
+    return quota_scheduler.metrics()
+
 @app.post("/recommend-videos/", response_model=List[VideoRecommendation])
-async def recommend_videos(request: ReportRequest):
+async def recommend_videos(request: ReportRequest, http_request: Request, http_response: Response):
     try:
-        # Generate recommendations using the existing functions
-        recommendations = generate_video_recommendations(request.report_text)
+        # Generate recommendations without blocking the event loop, within the request deadline
+        deadline_ms = request_deadline_ms(http_request.headers.get('x-request-deadline-ms'), request.deadline_ms)
+        recommendations = await generate_video_recommendations_async(
+            request.report_text, enrich=request.enrich, deadline_ms=deadline_ms
+        )
+        
+        # Skills cut off by the deadline are reported in headers to keep the response body a plain list
+        if recommendations.partial:
+            http_response.headers['X-Partial-Results'] = 'true'
+            http_response.headers['X-Pending-Skills'] = json.dumps(recommendations.pending)
         
         # Format the response
         response = []
@@ -48,6 +83,51 @@ async def recommend_videos(request: ReportRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/recommend-videos/batch/", response_model=List[BatchRecommendationResult])
+async def recommend_videos_batch(request: BatchReportRequest):
+    if len(request.report_texts) > MAX_BATCH_REPORTS:
+        raise HTTPException(status_code=400, detail=f"Too many reports: at most {MAX_BATCH_REPORTS} per batch")
+    
+    try:
+        results = await generate_batch_recommendations_async(request.report_texts, enrich=request.enrich)
+        
+        # Format the response
+        response = []
+        for index, result in enumerate(results):
+            if result['status'] != 'success':
+                response.append({"index": index, "status": result['status'], "message": result['message']})
+                continue
+            response.append({
+                "index": index,
+                "status": "success",
+                "recommendations": [
+                    {"skill": skill, "videos": [{"title": title, "url": url} for title, url in videos]}
+                    for skill, videos in result['recommendations'].items()
+                ]
+            })
+        
+        return response
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/recommend-videos/stream")
+async def stream_recommend_videos(request: ReportRequest, http_request: Request):
+    """Stream recommendations as Server-Sent Events or NDJSON as each skill resolves."""
+    stream_format = 'sse' if 'text/event-stream' in http_request.headers.get('accept', '') else 'ndjson'
+    deadline_ms = request_deadline_ms(http_request.headers.get('x-request-deadline-ms'), request.deadline_ms)
+    
+    async def generate():
+        try:
+            async for event in aiter_video_recommendations(request.report_text, enrich=request.enrich,
+                                                           deadline_ms=deadline_ms):
+                yield format_stream_event(event, stream_format)
+        except Exception as e:
+            yield format_stream_event({'event': 'error', 'message': str(e)}, stream_format)
+    
+    media_type = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    return StreamingResponse(generate(), media_type=media_type, headers={'Cache-Control': 'no-cache'})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app:app", host="0.0.0.0", port=int(os.getenv("PORT", 8000)), reload=True)
@@ -0,0 +1,91 @@
+import os
+import re
+import sys
+import subprocess
+from typing import Dict, List, Tuple
+
+# Entry points and the module each one imports at startup
+ENTRY_POINTS = {
+    'cli': 'main',
+    'flask': 'wsgi',
+    'fastapi': 'app',
+}
+
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$')
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """Import module in a fresh interpreter with `python -X importtime`.
+
+    Args:
+        module: Name of the module to import
+
+    Returns:
+        Tuple of (cumulative import time of module in ms, list of (ms, name) for
+        the modules it imported directly, slowest first)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    total_ms = 0.0
+    children = []
+    pending = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        depth = len(match.group(3)) // 2
+        name = match.group(4)
+        if depth == 1:
+            pending.append((cumulative_ms, name))
+        elif depth == 0:
+            # importtime prints children before their parent
+            if name == module:
+                total_ms = cumulative_ms
+                children = pending
+            pending = []
+
+    return total_ms, sorted(children, reverse=True)
+
+
+def main():
+    """Report cold import time for each entry point and optionally enforce a budget."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Measure cold-start import time of each entry point.')
+    parser.add_argument('--max-ms', type=float, default=None,
+                       help='Exit with status 1 if any entry point takes longer than this to import')
+    parser.add_argument('--top', type=int, default=5,
+                       help='Number of slowest direct imports to list per entry point (default: 5)')
+    parser.add_argument('entry_points', nargs='*', default=list(ENTRY_POINTS),
+                       help=f'Entry points to measure (default: {" ".join(ENTRY_POINTS)})')
+
+    args = parser.parse_args()
+
+    results: Dict[str, float] = {}
+    for entry_point in args.entry_points:
+        module = ENTRY_POINTS.get(entry_point, entry_point)
+        total_ms, children = measure_import(module)
+        results[entry_point] = total_ms
+
+        print(f"{entry_point} (import {module}): {total_ms:.1f} ms")
+        for child_ms, name in children[:args.top]:
+            print(f"    {child_ms:8.1f} ms  {name}")
+
+    if args.max_ms is not None:
+        slow = {name: ms for name, ms in results.items() if ms > args.max_ms}
+        if slow:
+            print(f"❌ Over the {args.max_ms:.0f} ms budget: {', '.join(slow)}")
+            sys.exit(1)
+        print(f"✅ All entry points import within {args.max_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
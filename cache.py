@@ -0,0 +1,312 @@
+import os
+import json
+import time
+import random
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable content-addressed key from JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TTLCache:
+    """Thread-safe in-memory LRU cache whose entries expire after a fixed TTL.
+
+    Args:
+        max_entries: Maximum number of entries kept before the least recently used is evicted
+        ttl: Time-to-live in seconds. A value of 0 or less disables the cache
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default if it is missing or expired."""
+        if not self.enabled:
+            return default
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries if full."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """LRU cache with expiring entries stored in a SQLite database.
+
+    The database runs in WAL mode so every gunicorn worker on a host can share
+    one file, and entries survive restarts and deploys. Values must be
+    JSON-serializable; tuples come back as lists.
+
+    Args:
+        path: Path to the SQLite database file
+        namespace: Name that separates this cache's keys from other caches in the same file
+        max_entries: Maximum number of entries kept in the namespace
+        ttl: Time-to-live in seconds. A value of 0 or less disables the cache
+    """
+
+    # Fraction of writes that also purge expired and least recently used entries
+    EVICTION_PROBABILITY = 1 / 64
+    # Seconds a hit may leave accessed_at stale, so hot keys do not write on every read
+    TOUCH_INTERVAL = 60.0
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 1024, ttl: float = 3600):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+
+        if self.enabled:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache_entries ("
+                    " namespace TEXT NOT NULL,"
+                    " key TEXT NOT NULL,"
+                    " value TEXT NOT NULL,"
+                    " expires_at REAL NOT NULL,"
+                    " accessed_at REAL NOT NULL,"
+                    " PRIMARY KEY (namespace, key))"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS cache_entries_accessed"
+                    " ON cache_entries (namespace, accessed_at)"
+                )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default if it is missing or expired."""
+        if not self.enabled:
+            return default
+
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at, accessed_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+                if row is None:
+                    return default
+
+                value, expires_at, accessed_at = row
+                if expires_at <= now:
+                    conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key)
+                    )
+                    return default
+
+                if now - accessed_at >= self.TOUCH_INTERVAL:
+                    conn.execute(
+                        "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                        (now, self.namespace, key)
+                    )
+            return json.loads(value)
+        except sqlite3.Error as e:
+            print(f"Warning: Cache read failed: {e}")
+            return default
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, occasionally evicting expired and least recently used entries."""
+        if not self.enabled:
+            return
+
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, json.dumps(value), now + self.ttl, now)
+                )
+                if random.random() < self.EVICTION_PROBABILITY:
+                    self._evict(conn, now)
+        except sqlite3.Error as e:
+            print(f"Warning: Cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+            (self.namespace, now)
+        )
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache_entries WHERE namespace = ?"
+            " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries)
+        )
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def __len__(self) -> int:
+        if not self.enabled:
+            return 0
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()
+        return row[0]
+
+
+def create_cache(namespace: str, max_entries: int, ttl: float,
+                 backend: str = 'memory', path: Optional[str] = None):
+    """Create a cache for the configured backend.
+
+    Args:
+        namespace: Name of the cache, used to separate entries in shared backends
+        max_entries: Maximum number of entries kept
+        ttl: Time-to-live in seconds
+        backend: 'memory' for a per-process cache or 'sqlite' for one shared across processes
+        path: Database path for the 'sqlite' backend
+
+    Returns:
+        A TTLCache or SQLiteCache instance
+    """
+    backend = (backend or 'memory').lower()
+    if backend == 'sqlite':
+        return SQLiteCache(path or 'cache.sqlite3', namespace, max_entries=max_entries, ttl=ttl)
+    if backend != 'memory':
+        print(f"Warning: Unknown cache backend '{backend}', using in-memory cache")
+    return TTLCache(max_entries=max_entries, ttl=ttl)
+
+
+class InFlightTimeout(Exception):
+    """Raised when a caller gives up waiting for a call another caller has in flight."""
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one upstream call.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait and receive the same result or exception. Works for threads
+    (do) and for coroutines on an event loop (do_async). With wait_timeout, a
+    caller stops waiting after that many seconds and gets InFlightTimeout.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+
+    def do(self, key: str, fn, *args, wait_timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) unless a call for key is already in flight, then share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            if not call.done.wait(wait_timeout):
+                raise InFlightTimeout(f"Gave up waiting for in-flight call after {wait_timeout:.3f}s")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, fn, *args, wait_timeout: Optional[float] = None, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) unless a call for key is already in flight on this loop.
+
+        The call runs as its own task, so a caller that is cancelled stops
+        waiting without cancelling the call for the others.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        task = self._async_calls.get(flight_key)
+        if task is None or task.done():
+            task = loop.create_task(fn(*args, **kwargs))
+            self._async_calls[flight_key] = task
+            task.add_done_callback(lambda t: self._finish_async(flight_key, t))
+        if wait_timeout is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), wait_timeout)
+        except asyncio.TimeoutError:
+            if task.done():
+                raise
+            raise InFlightTimeout(f"Gave up waiting for in-flight call after {wait_timeout:.3f}s")
+
+    def _finish_async(self, flight_key: Tuple[int, str], task: 'asyncio.Task') -> None:
+        if self._async_calls.get(flight_key) is task:
+            del self._async_calls[flight_key]
+        # Mark the outcome as retrieved even when every caller stopped waiting
+        if not task.cancelled():
+            task.exception()
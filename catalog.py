@@ -0,0 +1,241 @@
+import os
+import re
+import json
+import gzip
+import math
+import heapq
+from typing import Any, Callable, Dict, List, Optional
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'in', 'is', 'it',
+    'of', 'on', 'or', 'that', 'the', 'this', 'to', 'with', 'your', 'you',
+])
+# Title terms count this many times toward a video's term frequencies
+TITLE_WEIGHT = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into index terms, keeping names like c++ and c#."""
+    return [token for token in TOKEN_PATTERN.findall((text or '').lower()) if token not in STOPWORDS]
+
+
+class VideoCatalog:
+    """Local catalog of videos searchable with BM25 over an inverted index.
+
+    Videos are ingested from JSONL records with id, title, description, tags
+    and duration fields, and the index is saved as gzipped JSON so it can be
+    built offline and loaded by every worker. Search results use the same
+    shape as YouTube search.list items, so they go through the same filters.
+
+    Args:
+        k1: BM25 term frequency saturation
+        b: BM25 document length normalization
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.videos = []
+        self.doc_lengths = []
+        # term -> flat [doc, tf, doc, tf, ...] list, which is much smaller than pairs
+        self.postings = {}
+        self._ids = {}
+
+    def __len__(self) -> int:
+        return len(self.videos)
+
+    @property
+    def _avg_length(self) -> float:
+        return sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0.0
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """Index one video record, returning False if it is invalid or already indexed."""
+        video_id = str(record.get('id') or '').strip()
+        title = str(record.get('title') or '').strip()
+        if not video_id or not title or video_id in self._ids:
+            return False
+
+        description = str(record.get('description') or '')
+        tags = record.get('tags') or []
+        if isinstance(tags, str):
+            tags = [tags]
+
+        doc = len(self.videos)
+        self._ids[video_id] = doc
+        self.videos.append([video_id, title, description, list(tags), record.get('duration')])
+
+        frequencies = {}
+        terms = tokenize(title) * TITLE_WEIGHT + tokenize(description) + tokenize(' '.join(map(str, tags)))
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term, tf in frequencies.items():
+            self.postings.setdefault(term, []).extend((doc, tf))
+        self.doc_lengths.append(len(terms))
+        return True
+
+    def ingest_jsonl(self, path: str) -> int:
+        """Index every video in a JSONL file and return how many were added."""
+        added = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Warning: Skipping invalid catalog record at {path}:{line_number}: {e}")
+                    continue
+                if isinstance(record, dict) and self.add(record):
+                    added += 1
+        return added
+
+    def save(self, path: str) -> None:
+        """Write the catalog and its index to a gzipped JSON file, replacing it atomically."""
+        payload = {
+            'version': self.FORMAT_VERSION,
+            'k1': self.k1,
+            'b': self.b,
+            'videos': self.videos,
+            'doc_lengths': self.doc_lengths,
+            'postings': self.postings,
+        }
+        temp_path = f"{path}.tmp"
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'VideoCatalog':
+        """Load a catalog saved by save().
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a catalog in a supported format
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+        if not isinstance(payload, dict) or payload.get('version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported catalog format in {path}")
+
+        try:
+            catalog = cls(k1=payload['k1'], b=payload['b'])
+            catalog.videos = payload['videos']
+            catalog.doc_lengths = payload['doc_lengths']
+            catalog.postings = payload['postings']
+        except KeyError as e:
+            raise ValueError(f"Catalog {path} is missing {e}")
+        catalog._ids = {video[0]: doc for doc, video in enumerate(catalog.videos)}
+        return catalog
+
+    def _idf(self, term: str) -> float:
+        matching = len(self.postings.get(term, ())) // 2
+        return math.log(1 + (len(self.videos) - matching + 0.5) / (matching + 0.5))
+
+    def search(self, query: str, limit: int = 10, min_match: float = 0.5,
+               accept: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """Return the best BM25 matches for query as search.list-shaped items.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of videos to return
+            min_match: Fraction of the query's IDF weight a video must match.
+                       Rare terms (e.g. a skill name) weigh much more than common
+                       ones, so topics the catalog has never seen return nothing.
+            accept: Optional filter applied in score order until limit items pass
+
+        Returns:
+            List of items with 'id', 'snippet' and 'score', best first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.videos:
+            return []
+
+        idfs = {term: self._idf(term) for term in terms}
+        required = min_match * sum(idfs.values())
+        avg_length = self._avg_length or 1.0
+
+        scores = {}
+        matched = {}
+        for term in terms:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = idfs[term]
+            for doc, tf in zip(posting[::2], posting[1::2]):
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc] / avg_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+                matched[doc] = matched.get(doc, 0.0) + idf
+
+        candidates = [doc for doc in scores if matched[doc] >= required]
+        if accept is None:
+            return [self._item(doc, scores[doc]) for doc in heapq.nlargest(limit, candidates, key=scores.get)]
+
+        items = []
+        for doc in sorted(candidates, key=scores.get, reverse=True):
+            item = self._item(doc, scores[doc])
+            if accept(item):
+                items.append(item)
+                if len(items) >= limit:
+                    break
+        return items
+
+    def _item(self, doc: int, score: float) -> Dict[str, Any]:
+        video_id, title, description, _, _ = self.videos[doc]
+        return {
+            'id': {'videoId': video_id},
+            'snippet': {'title': title, 'description': description},
+            'score': round(score, 4),
+        }
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored record for a video, or None if it is not in the catalog."""
+        doc = self._ids.get(video_id)
+        if doc is None:
+            return None
+        video_id, title, description, tags, duration = self.videos[doc]
+        return {'id': video_id, 'title': title, 'description': description, 'tags': tags, 'duration': duration}
+
+
+def main():
+    """Build a catalog index from JSONL files or query an existing one."""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Build or query the local video catalog.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Index JSONL video records')
+    build_parser.add_argument('sources', nargs='+', help='JSONL files with id, title, description, tags and duration')
+    build_parser.add_argument('--output', default=os.getenv('CATALOG_PATH', 'catalog.json.gz'),
+                              help='Index file to write (default: CATALOG_PATH or catalog.json.gz)')
+
+    search_parser = subparsers.add_parser('search', help='Query an index')
+    search_parser.add_argument('query', help='Search query')
+    search_parser.add_argument('--catalog', default=os.getenv('CATALOG_PATH', 'catalog.json.gz'),
+                               help='Index file to read (default: CATALOG_PATH or catalog.json.gz)')
+    search_parser.add_argument('--limit', type=int, default=10, help='Number of results (default: 10)')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        catalog = VideoCatalog()
+        for source in args.sources:
+            print(f"{source}: {catalog.ingest_jsonl(source)} video(s) added")
+        catalog.save(args.output)
+        print(f"Indexed {len(catalog)} video(s) and {len(catalog.postings)} term(s) into {args.output}")
+        return
+
+    catalog = VideoCatalog.load(args.catalog)
+    started = time.perf_counter()
+    items = catalog.search(args.query, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for item in items:
+        print(f"{item['score']:8.3f}  {item['snippet']['title']}  https://www.youtube.com/watch?v={item['id']['videoId']}")
+    print(f"{len(items)} result(s) in {elapsed_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
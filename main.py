@@ -1,13 +1,31 @@
 import os
+import re
 import sys
+import glob
 import json
-from typing import List, Dict, Any, Optional, Tuple
-from openai import OpenAI
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import math
+import time
+import asyncio
+import threading
+import weakref
+import contextvars
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed, wait
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple, Iterator, AsyncIterator
+
+# Wall-clock cost of starting up, reported by the health check
+STARTUP_METRICS = {}
+_import_started = time.perf_counter()
+
+# openai, googleapiclient, httpx and flask are imported on first use so each
+# entry point only pays for the clients it actually needs
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from cache import InFlightTimeout, SingleFlight, create_cache, make_cache_key
+from ratelimit import create_rate_limiter
+from quota import QUOTA_COSTS, QuotaLedger, QuotaScheduler, LEVEL_FEWER_SOFT_SKILLS, LEVEL_REDUCED_RESULTS, LEVEL_CACHE_ONLY
+from skills import SkillCanonicalizer, load_synonyms
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,272 +35,2373 @@ DEFAULT_SKILLS = ["Communication", "Confidence", "Decision-making"]
 DEFAULT_VIDEO_COUNT = int(os.getenv('DEFAULT_VIDEO_COUNT', '2'))
 DEFAULT_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4')
 DEFAULT_TEMPERATURE = float(os.getenv('OPENAI_TEMPERATURE', '0.3'))
+# 'auto' reads structured "Scoring:" blocks locally and only calls the LLM otherwise, 'llm' always calls it
+EXTRACTION_MODE = os.getenv('EXTRACTION_MODE', 'auto').lower()
+SCORE_WEAK_THRESHOLD = float(os.getenv('SCORE_WEAK_THRESHOLD', '0.5'))
+SEARCH_CONCURRENCY = int(os.getenv('SEARCH_CONCURRENCY', '4'))
+EXTRACTION_BATCH_TOKEN_BUDGET = int(os.getenv('EXTRACTION_BATCH_TOKEN_BUDGET', '6000'))
+MAX_BATCH_REPORTS = int(os.getenv('MAX_BATCH_REPORTS', '1000'))
+STREAM_EXTRACTION = os.getenv('STREAM_EXTRACTION', 'false').lower() in ('1', 'true', 'yes')
+YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+# Optional path to a YouTube discovery document to use instead of the one bundled with the client library
+YOUTUBE_DISCOVERY_DOC = os.getenv('YOUTUBE_DISCOVERY_DOC')
+# Partial-response projection for search.list; only the fields the filters and results use
+YOUTUBE_SEARCH_FIELDS = os.getenv('YOUTUBE_SEARCH_FIELDS', 'nextPageToken,items(id/videoId,snippet/title,snippet/description)')
+# Hard cap on search.list pages fetched per query; each page costs 100 quota units
+YOUTUBE_MAX_PAGES = int(os.getenv('YOUTUBE_MAX_PAGES', '3'))
+YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+# Rank search candidates by duration, views, likes and age from batched videos.list lookups
+ENRICH_RESULTS = os.getenv('ENRICH_RESULTS', 'false').lower() in ('1', 'true', 'yes')
+ENRICH_CANDIDATE_FACTOR = int(os.getenv('ENRICH_CANDIDATE_FACTOR', '3'))
+YOUTUBE_VIDEO_CACHE_TTL = int(os.getenv('YOUTUBE_VIDEO_CACHE_TTL', '86400'))
+YOUTUBE_VIDEO_CACHE_SIZE = int(os.getenv('YOUTUBE_VIDEO_CACHE_SIZE', '20000'))
+# 'youtube' searches live; 'catalog' searches the local index at CATALOG_PATH first
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'youtube').lower()
+CATALOG_PATH = os.getenv('CATALOG_PATH', 'catalog.json.gz')
+CATALOG_MIN_MATCH = float(os.getenv('CATALOG_MIN_MATCH', '0.5'))
+CATALOG_FALLBACK = os.getenv('CATALOG_FALLBACK', 'true').lower() in ('1', 'true', 'yes')
+# Precomputed search results for the most requested skills, refreshed in the background
+SKILL_TABLE = os.getenv('SKILL_TABLE', 'false').lower() in ('1', 'true', 'yes')
+SKILL_TABLE_PATH = os.getenv('SKILL_TABLE_PATH', 'skill_table.json')
+SKILL_TABLE_SKILLS = [skill.strip() for skill in os.getenv(
+    'SKILL_TABLE_SKILLS', ','.join(DEFAULT_SKILLS + ["Technical Interview Skills"])
+).split(',') if skill.strip()]
+SKILL_TABLE_DEPTH = int(os.getenv('SKILL_TABLE_DEPTH', '10'))
+SKILL_TABLE_SIZE = int(os.getenv('SKILL_TABLE_SIZE', '1000'))
+SKILL_TABLE_REFRESH_INTERVAL = float(os.getenv('SKILL_TABLE_REFRESH_INTERVAL', '86400'))
+SKILL_TABLE_ENTRY_TTL = float(os.getenv('SKILL_TABLE_ENTRY_TTL', '86400'))
+SKILL_TABLE_REFRESH_QUOTA = float(os.getenv('SKILL_TABLE_REFRESH_QUOTA', '0.2'))
+# Fold variants like "Core Java concepts" onto one canonical skill before planning searches
+SKILL_CANONICALIZATION = os.getenv('SKILL_CANONICALIZATION', 'true').lower() in ('1', 'true', 'yes')
+SKILL_SYNONYMS_PATH = os.getenv('SKILL_SYNONYMS_PATH')
+SKILL_MATCH_THRESHOLD = float(os.getenv('SKILL_MATCH_THRESHOLD', '0.6'))
+# Reuse weak areas extracted from a near-duplicate report instead of calling the LLM again
+SEMANTIC_CACHE = os.getenv('SEMANTIC_CACHE', 'false').lower() in ('1', 'true', 'yes')
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.95'))
+SEMANTIC_CACHE_SIZE = int(os.getenv('SEMANTIC_CACHE_SIZE', '2000'))
+SEMANTIC_CACHE_DIMENSIONS = int(os.getenv('SEMANTIC_CACHE_DIMENSIONS', '2048'))
+YOUTUBE_POOL_SIZE = int(os.getenv('YOUTUBE_POOL_SIZE', '8'))
+YOUTUBE_HTTP_TIMEOUT = float(os.getenv('YOUTUBE_HTTP_TIMEOUT', '30'))
+OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', '60'))
+# Default and maximum time budget for a web request, in milliseconds; 0 disables the default
+REQUEST_DEADLINE_MS = int(os.getenv('REQUEST_DEADLINE_MS', '25000'))
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', '86400'))
+LLM_CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', '1024'))
+YOUTUBE_CACHE_TTL = int(os.getenv('YOUTUBE_CACHE_TTL', '21600'))
+YOUTUBE_CACHE_SIZE = int(os.getenv('YOUTUBE_CACHE_SIZE', '4096'))
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+CACHE_PATH = os.getenv('CACHE_PATH', 'cache.sqlite3')
+YOUTUBE_DAILY_QUOTA = int(os.getenv('YOUTUBE_DAILY_QUOTA', '10000'))
+# The ledger persists whatever the cache backend is; an empty path keeps counts in memory
+QUOTA_LEDGER_PATH = os.getenv('QUOTA_LEDGER_PATH', CACHE_PATH)
+QUOTA_FEWER_SOFT_SKILLS_AT = float(os.getenv('QUOTA_FEWER_SOFT_SKILLS_AT', '0.3'))
+QUOTA_REDUCED_RESULTS_AT = float(os.getenv('QUOTA_REDUCED_RESULTS_AT', '0.15'))
+QUOTA_CACHE_ONLY_AT = float(os.getenv('QUOTA_CACHE_ONLY_AT', '0.05'))
+# Client-side rate limits; 0 disables a limiter
+OPENAI_REQUESTS_PER_SECOND = float(os.getenv('OPENAI_REQUESTS_PER_SECOND', '5'))
+OPENAI_TOKENS_PER_MINUTE = float(os.getenv('OPENAI_TOKENS_PER_MINUTE', '0'))
+YOUTUBE_QUERIES_PER_SECOND = float(os.getenv('YOUTUBE_QUERIES_PER_SECOND', '10'))
+RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '10'))
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', CACHE_BACKEND)
+# Completion tokens assumed per extraction when charging the tokens-per-minute limiter
+OPENAI_COMPLETION_TOKEN_ESTIMATE = 200
+
+class DeadlineExceeded(Exception):
+    """Raised when an upstream call would start or run past the request deadline."""
+
+# time.monotonic() deadline of the request being served. Context variables follow
+# asyncio tasks automatically; thread pool work is submitted with _submit() to carry it.
+_request_deadline = contextvars.ContextVar('request_deadline', default=None)
+
+def _deadline_after(deadline_ms: Optional[int]) -> Optional[float]:
+    """Return the time.monotonic() deadline deadline_ms from now, or None for no deadline."""
+    if not deadline_ms or deadline_ms <= 0:
+        return None
+    return time.monotonic() + deadline_ms / 1000
+
+@contextmanager
+def _deadline_until(deadline: Optional[float]):
+    """Bound every upstream call made inside the block by a time.monotonic() deadline.
+    
+    Generators must not yield inside the block, since the consumer would run under the deadline too.
+    """
+    if deadline is None:
+        yield
+        return
+    current = _request_deadline.get()
+    token = _request_deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+def _deadline_scope(deadline_ms: Optional[int]):
+    """Bound every upstream call made inside the block by a deadline deadline_ms from now."""
+    return _deadline_until(_deadline_after(deadline_ms))
+
+def _time_left() -> Optional[float]:
+    """Return seconds until the current request's deadline, or None if it has none."""
+    deadline = _request_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def _deadline_passed() -> bool:
+    left = _time_left()
+    return left is not None and left <= 0
+
+def _upstream_timeout(default: float) -> float:
+    """Return the timeout for an upstream call: default, cut short by the request deadline.
+    
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    left = _time_left()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(default, left)
+
+def _submit(executor: ThreadPoolExecutor, fn, *args, **kwargs):
+    """Submit fn to executor in a copy of the current context, so it sees the request deadline."""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+def _wait_timeout() -> Optional[float]:
+    """Return how long to wait on another caller's work: the time left before the deadline, if any."""
+    left = _time_left()
+    return None if left is None else max(0.0, left)
+
+def _run_shared(flight: SingleFlight, key: str, fn) -> Any:
+    """Run fn through flight, starting it again if the shared call ran out of another request's deadline.
+    
+    A call made by a request with a short deadline fails for every request
+    sharing it. Those failures are raised as DeadlineExceeded, and callers
+    that still have time left run the call again instead of giving up.
+    Callers wait for a shared call only until their own deadline.
+    """
+    def bounded():
+        try:
+            return fn()
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            if _deadline_passed():
+                raise DeadlineExceeded(f"Request deadline exceeded: {e}") from e
+            raise
+    
+    while True:
+        try:
+            return flight.do(key, bounded, wait_timeout=_wait_timeout())
+        except InFlightTimeout as e:
+            raise DeadlineExceeded(f"Request deadline exceeded waiting for a shared call: {e}") from e
+        except DeadlineExceeded:
+            if _deadline_passed():
+                raise
+
+async def _run_shared_async(flight: SingleFlight, key: str, fn) -> Any:
+    """Async version of _run_shared."""
+    async def bounded():
+        try:
+            return await fn()
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            if _deadline_passed():
+                raise DeadlineExceeded(f"Request deadline exceeded: {e}") from e
+            raise
+    
+    while True:
+        try:
+            return await flight.do_async(key, bounded, wait_timeout=_wait_timeout())
+        except InFlightTimeout as e:
+            raise DeadlineExceeded(f"Request deadline exceeded waiting for a shared call: {e}") from e
+        except DeadlineExceeded:
+            if _deadline_passed():
+                raise
+
+def request_deadline_ms(header_value: Any = None, body_value: Any = None) -> Optional[int]:
+    """Return the deadline for a web request from its header or body, capped by REQUEST_DEADLINE_MS.
+    
+    Args:
+        header_value: Value of the X-Request-Deadline-Ms header, if sent
+        body_value: Value of the deadline_ms body field, if sent; the header wins
+        
+    Returns:
+        Deadline in milliseconds, or None for no deadline
+    """
+    for value in (header_value, body_value):
+        if value is None or value == '':
+            continue
+        try:
+            requested = int(float(value))
+        except (TypeError, ValueError):
+            print(f"Warning: Ignoring invalid request deadline {value!r}")
+            continue
+        if requested > 0:
+            return min(requested, REQUEST_DEADLINE_MS) if REQUEST_DEADLINE_MS > 0 else requested
+    return REQUEST_DEADLINE_MS if REQUEST_DEADLINE_MS > 0 else None
+
+# OpenAI clients, created on first use by get_openai_client() and get_async_openai_client()
+_openai_client = None
+_async_openai_client = None
+_openai_lock = threading.Lock()
+
+def get_openai_client():
+    """Return the OpenAI client, creating it on first use."""
+    global _openai_client
+    if _openai_client is None:
+        with _openai_lock:
+            if _openai_client is None:
+                from openai import OpenAI
+                _openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), timeout=OPENAI_TIMEOUT)
+    return _openai_client
+
+def get_async_openai_client():
+    """Return the AsyncOpenAI client, creating it on first use."""
+    global _async_openai_client
+    if _async_openai_client is None:
+        with _openai_lock:
+            if _async_openai_client is None:
+                from openai import AsyncOpenAI
+                _async_openai_client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'), timeout=OPENAI_TIMEOUT)
+    return _async_openai_client
+
+# YouTube API service, built on first use by get_youtube_service()
+youtube = None
+_youtube_lock = threading.Lock()
+
+def _build_youtube_service():
+    """Build the YouTube service from a static discovery document, without a network fetch."""
+    from googleapiclient.discovery import build, build_from_document
+    
+    if YOUTUBE_DISCOVERY_DOC:
+        with open(YOUTUBE_DISCOVERY_DOC, 'r', encoding='utf-8') as f:
+            return build_from_document(f.read(), developerKey=YOUTUBE_API_KEY)
+    # The client library bundles discovery documents for its supported APIs
+    return build("youtube", "v3", developerKey=YOUTUBE_API_KEY, static_discovery=True, cache_discovery=False)
+
+def get_youtube_service():
+    """Return the YouTube API service, building it on first use.
+    
+    Raises:
+        RuntimeError: If YOUTUBE_API_KEY is not set or the service cannot be built
+    """
+    global youtube
+    if youtube is not None:
+        return youtube
+    if not YOUTUBE_API_KEY:
+        raise RuntimeError("YouTube API not initialized. Please check your YOUTUBE_API_KEY in .env file.")
+    
+    with _youtube_lock:
+        if youtube is None:
+            started = time.perf_counter()
+            try:
+                youtube = _build_youtube_service()
+            except Exception as e:
+                print(f"Warning: Failed to initialize YouTube API: {e}")
+                raise RuntimeError(f"Failed to initialize YouTube API: {e}")
+            finally:
+                STARTUP_METRICS['youtube_client_init_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return youtube
+
+# Cache of extracted weak areas, keyed by report content and model settings
+llm_cache = create_cache('llm', LLM_CACHE_SIZE, LLM_CACHE_TTL, backend=CACHE_BACKEND, path=CACHE_PATH)
+# Cache of filtered search results; each search.list call costs 100 quota units
+search_cache = create_cache('youtube_search', YOUTUBE_CACHE_SIZE, YOUTUBE_CACHE_TTL,
+                            backend=CACHE_BACKEND, path=CACHE_PATH)
+# Cache of per-video details from videos.list, so popular videos are looked up once
+video_cache = create_cache('youtube_videos', YOUTUBE_VIDEO_CACHE_SIZE, YOUTUBE_VIDEO_CACHE_TTL,
+                           backend=CACHE_BACKEND, path=CACHE_PATH)
+
+async def _cache_io(fn, *args) -> Any:
+    """Run a function that reads or writes the caches, off the event loop with the SQLite backend."""
+    if CACHE_BACKEND == 'sqlite':
+        return await asyncio.to_thread(fn, *args)
+    return fn(*args)
+
+# Maps extracted skills to canonical names so equivalent skills share searches and cache entries
+skill_canonicalizer = SkillCanonicalizer(load_synonyms(SKILL_SYNONYMS_PATH), threshold=SKILL_MATCH_THRESHOLD)
+for _skill in DEFAULT_SKILLS + SKILL_TABLE_SKILLS:
+    skill_canonicalizer.add(_skill)
+# Concurrent cache misses for the same key share one upstream call
+llm_inflight = SingleFlight()
+search_inflight = SingleFlight()
+
+# YouTube quota spend, shared across workers and restarts through QUOTA_LEDGER_PATH
+quota_ledger = QuotaLedger(YOUTUBE_DAILY_QUOTA, path=QUOTA_LEDGER_PATH or None)
+quota_scheduler = QuotaScheduler(
+    quota_ledger,
+    fewer_soft_skills_at=QUOTA_FEWER_SOFT_SKILLS_AT,
+    reduced_results_at=QUOTA_REDUCED_RESULTS_AT,
+    cache_only_at=QUOTA_CACHE_ONLY_AT
+)
+
+# Token buckets in front of the OpenAI and YouTube clients, shared by all threads in the process
+openai_request_limiter = create_rate_limiter('openai_requests', OPENAI_REQUESTS_PER_SECOND,
+                                             backend=RATE_LIMIT_BACKEND, path=CACHE_PATH)
+openai_token_limiter = create_rate_limiter('openai_tokens', OPENAI_TOKENS_PER_MINUTE / 60,
+                                           capacity=OPENAI_TOKENS_PER_MINUTE,
+                                           backend=RATE_LIMIT_BACKEND, path=CACHE_PATH)
+youtube_limiter = create_rate_limiter('youtube_queries', YOUTUBE_QUERIES_PER_SECOND,
+                                      backend=RATE_LIMIT_BACKEND, path=CACHE_PATH)
+
+# httplib2.Http is not thread-safe, so requests run on connections checked out of a pool
+_youtube_pool = None
+
+def get_youtube_pool():
+    """Return the pool of YouTube API connections, creating it on first use."""
+    global _youtube_pool
+    if _youtube_pool is None:
+        with _youtube_lock:
+            if _youtube_pool is None:
+                from youtube_pool import YouTubeClientPool
+                _youtube_pool = YouTubeClientPool(size=YOUTUBE_POOL_SIZE, timeout=YOUTUBE_HTTP_TIMEOUT)
+    return _youtube_pool
+
+# Near-duplicate report cache, created on first use by get_semantic_cache()
+_semantic_cache = None
+_semantic_cache_loaded = False
+_semantic_cache_lock = threading.Lock()
+
+def get_semantic_cache():
+    """Return the semantic report cache, or None if it is disabled or NumPy is unavailable."""
+    global _semantic_cache, _semantic_cache_loaded
+    if not _semantic_cache_loaded:
+        with _semantic_cache_lock:
+            if not _semantic_cache_loaded:
+                if SEMANTIC_CACHE:
+                    try:
+                        from semantic_cache import SemanticReportCache
+                        _semantic_cache = SemanticReportCache(SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_DIMENSIONS,
+                                                              threshold=SEMANTIC_CACHE_THRESHOLD)
+                    except ImportError as e:
+                        print(f"Warning: Semantic report cache disabled: {e}")
+                _semantic_cache_loaded = True
+    return _semantic_cache
+
+# Local video catalog, loaded on first use by get_catalog()
+_catalog = None
+_catalog_loaded = False
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    """Return the local video catalog, loading it on first use, or None if it cannot be loaded."""
+    global _catalog, _catalog_loaded
+    if not _catalog_loaded:
+        with _catalog_lock:
+            if not _catalog_loaded:
+                from catalog import VideoCatalog
+                started = time.perf_counter()
+                try:
+                    _catalog = VideoCatalog.load(CATALOG_PATH)
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Failed to load video catalog {CATALOG_PATH}: {e}")
+                STARTUP_METRICS['catalog_load_ms'] = round((time.perf_counter() - started) * 1000, 1)
+                _catalog_loaded = True
+    return _catalog
+
+# Precomputed skill table, loaded on first use by get_skill_table()
+_skill_table = None
+_skill_table_lock = threading.Lock()
+
+def get_skill_table():
+    """Return the precomputed skill table, loading it and starting its workers on first use."""
+    global _skill_table
+    if _skill_table is None:
+        with _skill_table_lock:
+            if _skill_table is None:
+                from skill_table import SkillTable
+                table = SkillTable(_resolve_table_entry, path=SKILL_TABLE_PATH, max_entries=SKILL_TABLE_SIZE,
+                                   refresh_interval=SKILL_TABLE_REFRESH_INTERVAL, entry_ttl=SKILL_TABLE_ENTRY_TTL,
+                                   refresh_budget=_skill_table_refresh_budget)
+                table.load()
+                table.pin(_skill_table_keys(SKILL_TABLE_SKILLS))
+                table.start()
+                _skill_table = table
+    return _skill_table
+
+# httpx.AsyncClient connections are bound to the event loop that opened them
+_async_http_clients = weakref.WeakKeyDictionary()
+
+def _get_async_http() -> 'httpx.AsyncClient':
+    """Return an HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    http = _async_http_clients.get(loop)
+    if http is None:
+        import httpx
+        http = httpx.AsyncClient(timeout=YOUTUBE_HTTP_TIMEOUT)
+        _async_http_clients[loop] = http
+    return http
+
+EXTRACTION_PROMPT = """
+        Analyze this interview report and identify specific technical areas that need improvement.
+        Focus on programming languages, frameworks, and technical concepts mentioned.
+        
+        Report:
+        {report_text}
+        
+        Return a JSON object with:
+        {{
+            "technical_skills": ["specific technical topics"],
+            "soft_skills": ["other areas"]
+        }}
+        """
+# Bump whenever EXTRACTION_PROMPT or _parse_weak_areas changes so cached results are not reused
+EXTRACTION_PROMPT_VERSION = 1
+
+SCORING_HEADER_PATTERN = re.compile(r'^\s*scoring\s*:?\s*$', re.IGNORECASE | re.MULTILINE)
+SCORE_LINE_PATTERN = re.compile(r'^\s*([A-Za-z][A-Za-z0-9 &/\-]*?)\s*:\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*$')
+SCORE_TOTAL_NAMES = {'overall', 'total', 'overall score', 'total score'}
+
+def parse_scored_report(report_text: str) -> Optional[List[str]]:
+    """Extract weak areas from a report's "Scoring:" block without calling the LLM.
+    
+    Each "Dimension: score/max" line in the block is ranked by score ratio, and
+    dimensions at or below SCORE_WEAK_THRESHOLD are returned lowest first. If
+    every dimension scores above the threshold, the lowest one is returned.
+    
+    Args:
+        report_text: The interview analysis report text
+        
+    Returns:
+        List of weak areas, or None if the report has no recognizable scoring block
+    """
+    header = SCORING_HEADER_PATTERN.search(report_text)
+    if not header:
+        return None
+    
+    scores = []
+    for line in report_text[header.end():].splitlines():
+        if not line.strip():
+            continue
+        match = SCORE_LINE_PATTERN.match(line)
+        if not match:
+            # The block ends at the first line that is not a score
+            break
+        name, score, max_score = match.group(1).strip(), float(match.group(2)), float(match.group(3))
+        if name.lower() in SCORE_TOTAL_NAMES or max_score <= 0:
+            continue
+        scores.append((score / max_score, name))
+    
+    # A single line is too little structure to trust over the LLM
+    if len(scores) < 2:
+        return None
+    
+    ranked = sorted(scores, key=lambda item: item[0])
+    weak_areas = [name for ratio, name in ranked if ratio <= SCORE_WEAK_THRESHOLD]
+    return weak_areas or [ranked[0][1]]
+
+def _extraction_cache_key(report_text: str) -> str:
+    """Key a report by its whitespace-normalized content and the extraction settings."""
+    normalized = ' '.join(report_text.split())
+    return make_cache_key(normalized, DEFAULT_MODEL, DEFAULT_TEMPERATURE, EXTRACTION_PROMPT_VERSION)
+
+BATCH_EXTRACTION_PROMPT = """
+        Analyze each of these interview reports and identify specific technical areas that need improvement.
+        Focus on programming languages, frameworks, and technical concepts mentioned.
+        
+        Reports:
+        {reports}
+        
+        Return a JSON object with one entry per report, using the report IDs given above:
+        {{
+            "reports": [
+                {{
+                    "id": "report ID",
+                    "technical_skills": ["specific technical topics"],
+                    "soft_skills": ["other areas"]
+                }}
+            ]
+        }}
+        """
+
+def _build_extraction_request(report_text: str) -> Dict[str, Any]:
+    """Build the chat completion arguments for extracting weak areas from a report."""
+    request_kwargs = {
+        'model': DEFAULT_MODEL,
+        'messages': [{"role": "user", "content": EXTRACTION_PROMPT.format(report_text=report_text)}],
+        'temperature': DEFAULT_TEMPERATURE,
+    }
+    # Use response_format for modern models
+    if 'gpt-4' in DEFAULT_MODEL.lower() or 'gpt-3.5-turbo' in DEFAULT_MODEL.lower():
+        request_kwargs['response_format'] = {"type": "json_object"}
+    return request_kwargs
+
+def _skills_from_result(result: Dict[str, Any]) -> List[str]:
+    """Combine the skill lists of a parsed extraction result, technical skills first."""
+    # Extract both technical and soft skills
+    technical_skills = result.get('technical_skills', [])
+    soft_skills = result.get('soft_skills', [])
+    
+    # If no technical skills found, add a default one
+    if not technical_skills:
+        technical_skills = ["Technical Interview Skills"]
+        
+    # Combine them with technical skills first
+    return technical_skills + soft_skills
+
+def _parse_weak_areas(raw: str) -> List[str]:
+    """Parse the model output into a list of skills, technical skills first."""
+    # Try to parse as JSON, fallback to extracting skills from text if needed
+    try:
+        # Clean the response
+        if '```json' in raw:
+            raw = raw.split('```json')[1].split('```')[0].strip()
+        elif '```' in raw:
+            raw = raw.split('```')[1].strip()
+            
+        return _skills_from_result(json.loads(raw))
+        
+    except (json.JSONDecodeError, AttributeError):
+        # Fallback parsing if JSON parsing fails
+        print("Warning: Could not parse response as JSON. Attempting to extract skills from text...")
+        technical_skills = []
+        soft_skills = []
+        
+        # Look for technical skills first
+        for line in raw.split('\n'):
+            line = line.lower().strip()
+            if any(term in line for term in ['data struct', 'algorithm', 'system design', 'coding', 'programming', 'technical', 'computer science']):
+                skill = ' '.join(word.capitalize() for word in line.split())
+                if skill and skill not in technical_skills and len(skill) < 50:
+                    technical_skills.append(skill)
+        
+        # If no technical skills found, add a default one
+        if not technical_skills:
+            technical_skills = ["Technical Interview Skills"]
+            
+        # Get other skills
+        for line in raw.split('\n'):
+            line = line.strip()
+            if line and len(line) < 50 and line[0].isupper():
+                skill = line.split(':', 1)[0].strip()
+                if skill and skill not in technical_skills and skill not in soft_skills and len(skill) < 50:
+                    soft_skills.append(skill)
+                    
+        return technical_skills + (soft_skills if soft_skills else DEFAULT_SKILLS)
+
+def _precomputed_weak_areas(report_text: str) -> Optional[List[str]]:
+    """Return weak areas that can be resolved without calling the LLM, or None."""
+    if not report_text.strip():
+        print("Warning: Empty report text provided, using default skills")
+        return ["Technical Interview Skills"] + DEFAULT_SKILLS
+        
+    if EXTRACTION_MODE != 'llm':
+        scored_skills = parse_scored_report(report_text)
+        if scored_skills is not None:
+            return scored_skills
+        
+    cached = llm_cache.get(_extraction_cache_key(report_text))
+    if cached is not None:
+        return list(cached)
+    
+    semantic_cache = get_semantic_cache()
+    if semantic_cache is not None:
+        return semantic_cache.get(report_text)
+    
+    return None
+
+def _remember_weak_areas(report_text: str, skills: List[str]) -> None:
+    """Cache skills extracted by the LLM for this report and for near-duplicates of it."""
+    llm_cache.set(_extraction_cache_key(report_text), list(skills))
+    semantic_cache = get_semantic_cache()
+    if semantic_cache is not None:
+        semantic_cache.set(report_text, skills)
+
+def _estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of tokens in text (about four characters per token)."""
+    return len(text) // 4 + 1
+
+def _completion_token_cost(request_kwargs: Dict[str, Any]) -> int:
+    """Estimate the tokens a chat completion will consume, for the tokens-per-minute limiter."""
+    prompt = ''.join(message['content'] for message in request_kwargs['messages'])
+    return _estimate_tokens(prompt) + OPENAI_COMPLETION_TOKEN_ESTIMATE
+
+def _with_deadline(client):
+    """Return client bounded by the request deadline, if any.
+    
+    The client's own retries are disabled under a deadline since each would get the full
+    remaining time; _complete retries instead while the deadline leaves room.
+    """
+    if _time_left() is None:
+        return client
+    return client.with_options(timeout=_upstream_timeout(OPENAI_TIMEOUT), max_retries=0)
+
+def _openai_retry_delay(error: Exception, attempt: int, max_retries: int) -> Optional[float]:
+    """Return the wait before retrying a failed completion, or None to give up.
+    
+    Mirrors the client's policy (connection errors, 408/409/429 and 5xx) but only retries
+    when the request deadline still has room for the wait.
+    """
+    if attempt > max_retries:
+        return None
+    import openai
+    status = getattr(error, 'status_code', None)
+    if not (isinstance(error, openai.APIConnectionError) or status in (408, 409, 429)
+            or (isinstance(status, int) and status >= 500)):
+        return None
+    delay = min(0.5 * 2 ** (attempt - 1), 8.0)
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        delay = max(delay, float(headers.get('retry-after', 0)))
+    except (TypeError, ValueError):
+        pass
+    left = _time_left()
+    if left is not None and left <= delay:
+        return None
+    return delay
+
+def _complete(client, request_kwargs: Dict[str, Any]):
+    """Create a chat completion, retrying transient errors while the deadline allows."""
+    if _time_left() is None:
+        return client.chat.completions.create(**request_kwargs)
+    attempt = 0
+    while True:
+        try:
+            return _with_deadline(client).chat.completions.create(**request_kwargs)
+        except Exception as e:
+            attempt += 1
+            delay = _openai_retry_delay(e, attempt, client.max_retries)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+async def _complete_async(client, request_kwargs: Dict[str, Any]):
+    """Async version of _complete."""
+    if _time_left() is None:
+        return await client.chat.completions.create(**request_kwargs)
+    attempt = 0
+    while True:
+        try:
+            return await _with_deadline(client).chat.completions.create(**request_kwargs)
+        except Exception as e:
+            attempt += 1
+            delay = _openai_retry_delay(e, attempt, client.max_retries)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+
+def _create_chat_completion(request_kwargs: Dict[str, Any]):
+    """Create a chat completion, retrying without response_format if the model rejects it."""
+    # Queue for capacity instead of running into 429s from OpenAI
+    openai_request_limiter.acquire(timeout=_upstream_timeout(RATE_LIMIT_MAX_WAIT))
+    openai_token_limiter.acquire(_completion_token_cost(request_kwargs), timeout=_upstream_timeout(RATE_LIMIT_MAX_WAIT))
+    try:
+        return _complete(get_openai_client(), request_kwargs)
+    except Exception as e:
+        if 'response_format' in str(e) and 'response_format' in request_kwargs:
+            # Retry without response_format if it's not supported
+            request_kwargs = {k: v for k, v in request_kwargs.items() if k != 'response_format'}
+            return _complete(get_openai_client(), request_kwargs)
+        raise
+
+async def _create_chat_completion_async(request_kwargs: Dict[str, Any]):
+    """Async version of _create_chat_completion."""
+    await openai_request_limiter.acquire_async(timeout=_upstream_timeout(RATE_LIMIT_MAX_WAIT))
+    await openai_token_limiter.acquire_async(_completion_token_cost(request_kwargs),
+                                             timeout=_upstream_timeout(RATE_LIMIT_MAX_WAIT))
+    try:
+        return await _complete_async(get_async_openai_client(), request_kwargs)
+    except Exception as e:
+        if 'response_format' in str(e) and 'response_format' in request_kwargs:
+            # Retry without response_format if it's not supported
+            request_kwargs = {k: v for k, v in request_kwargs.items() if k != 'response_format'}
+            return await _complete_async(get_async_openai_client(), request_kwargs)
+        raise
+
+def extract_weak_areas(report_text: str) -> List[str]:
+    """Extract weak areas from the report with focus on technical skills."""
+    try:
+        skills = _precomputed_weak_areas(report_text)
+        if skills is not None:
+            return skills
+            
+        cache_key = _extraction_cache_key(report_text)
+        
+        def fetch() -> List[str]:
+            response = _create_chat_completion(_build_extraction_request(report_text))
+            skills = _parse_weak_areas(response.choices[0].message.content.strip())
+            _remember_weak_areas(report_text, skills)
+            return skills
+        
+        return list(_run_shared(llm_inflight, cache_key, fetch))
+        
+    except Exception as e:
+        print(f"Error extracting weak areas: {e}")
+        raise Exception("Failed to extract weak areas from the report")
+
+async def extract_weak_areas_async(report_text: str) -> List[str]:
+    """Async version of extract_weak_areas using the AsyncOpenAI client."""
+    try:
+        skills = await _cache_io(_precomputed_weak_areas, report_text)
+        if skills is not None:
+            return skills
+            
+        cache_key = _extraction_cache_key(report_text)
+        
+        async def fetch() -> List[str]:
+            response = await _create_chat_completion_async(_build_extraction_request(report_text))
+            skills = _parse_weak_areas(response.choices[0].message.content.strip())
+            await _cache_io(_remember_weak_areas, report_text, skills)
+            return skills
+        
+        return list(await _run_shared_async(llm_inflight, cache_key, fetch))
+        
+    except Exception as e:
+        print(f"Error extracting weak areas: {e}")
+        raise Exception("Failed to extract weak areas from the report")
+
+class _SkillArrayParser:
+    """Incrementally pull skill strings out of a partially received JSON completion.
+    
+    Feed it chunks of the model output as they arrive; every string that closes
+    inside the "technical_skills" or "soft_skills" array is returned right away,
+    before the rest of the JSON object has been generated.
+    """
+    
+    SKILL_KEYS = ('technical_skills', 'soft_skills')
+    
+    def __init__(self):
+        self.text = ''
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string = None
+        self._array_key = None
+        self._depth = 0
+        self._array_depth = 0
+        
+    def feed(self, chunk: str) -> List[str]:
+        skills = []
+        offset = len(self.text)
+        self.text += chunk
+        
+        for index in range(offset, len(self.text)):
+            char = self.text[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    value = self._decode(self.text[self._string_start:index])
+                    if self._array_key and self._depth == self._array_depth:
+                        if value and value.strip():
+                            skills.append(value)
+                    else:
+                        self._last_string = value
+            elif char == '"':
+                self._in_string = True
+                self._string_start = index + 1
+            elif char in '[{':
+                self._depth += 1
+                if char == '[' and self._array_key is None and self._last_string in self.SKILL_KEYS:
+                    self._array_key = self._last_string
+                    self._array_depth = self._depth
+            elif char in ']}':
+                if self._array_key and self._depth == self._array_depth:
+                    self._array_key = None
+                self._depth -= 1
+                self._last_string = None
+        
+        return skills
+    
+    @staticmethod
+    def _decode(raw: str) -> Optional[str]:
+        try:
+            return json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return None
+
+def stream_weak_areas(report_text: str) -> Iterator[str]:
+    """Extract weak areas like extract_weak_areas, yielding each skill as soon as the model emits it.
+    
+    The chat completion is streamed and parsed incrementally, so callers can
+    start searching for the first skills while the rest are still decoding.
+    Reports resolved without the LLM are yielded straight away.
+    
+    Args:
+        report_text: The interview analysis report text
+        
+    Yields:
+        Skill strings in the order the model produces them
+    """
+    try:
+        skills = _precomputed_weak_areas(report_text)
+        if skills is not None:
+            yield from skills
+            return
+        
+        parser = _SkillArrayParser()
+        emitted = []
+        stream = _create_chat_completion(dict(_build_extraction_request(report_text), stream=True))
+        for chunk in stream:
+            # Read timeouts only bound the gap between chunks, not a completion that keeps streaming
+            if _deadline_passed():
+                stream.close()
+                raise DeadlineExceeded("Request deadline exceeded while streaming weak areas")
+            if not chunk.choices:
+                continue
+            for skill in parser.feed(chunk.choices[0].delta.content or ''):
+                emitted.append(skill)
+                yield skill
+        
+        # The full parse applies the same defaults and text fallback as extract_weak_areas
+        skills = _parse_weak_areas(parser.text.strip())
+        for skill in skills:
+            if skill not in emitted:
+                yield skill
+        _remember_weak_areas(report_text, skills)
+        
+    except Exception as e:
+        print(f"Error extracting weak areas: {e}")
+        raise Exception("Failed to extract weak areas from the report")
+
+async def astream_weak_areas(report_text: str) -> AsyncIterator[str]:
+    """Async version of stream_weak_areas using the AsyncOpenAI client."""
+    try:
+        skills = await _cache_io(_precomputed_weak_areas, report_text)
+        if skills is not None:
+            for skill in skills:
+                yield skill
+            return
+        
+        parser = _SkillArrayParser()
+        emitted = []
+        stream = await _create_chat_completion_async(dict(_build_extraction_request(report_text), stream=True))
+        async for chunk in stream:
+            # Read timeouts only bound the gap between chunks, not a completion that keeps streaming
+            if _deadline_passed():
+                await stream.close()
+                raise DeadlineExceeded("Request deadline exceeded while streaming weak areas")
+            if not chunk.choices:
+                continue
+            for skill in parser.feed(chunk.choices[0].delta.content or ''):
+                emitted.append(skill)
+                yield skill
+        
+        # The full parse applies the same defaults and text fallback as extract_weak_areas
+        skills = _parse_weak_areas(parser.text.strip())
+        for skill in skills:
+            if skill not in emitted:
+                yield skill
+        await _cache_io(_remember_weak_areas, report_text, skills)
+        
+    except Exception as e:
+        print(f"Error extracting weak areas: {e}")
+        raise Exception("Failed to extract weak areas from the report")
+
+def _pack_extraction_batches(report_texts: List[str], token_budget: int) -> List[List[int]]:
+    """Group report indices so each group's prompt stays within the token budget."""
+    overhead = _estimate_tokens(BATCH_EXTRACTION_PROMPT)
+    batches = []
+    current = []
+    current_tokens = overhead
+    
+    for index, report_text in enumerate(report_texts):
+        # Allow for the report header and the JSON entry the model writes back
+        tokens = _estimate_tokens(report_text) + 50
+        if current and current_tokens + tokens > token_budget:
+            batches.append(current)
+            current = []
+            current_tokens = overhead
+        current.append(index)
+        current_tokens += tokens
+    
+    if current:
+        batches.append(current)
+    return batches
+
+def _build_batch_extraction_request(report_texts: List[str]) -> Dict[str, Any]:
+    """Build the chat completion arguments for extracting weak areas from several reports."""
+    reports = '\n\n'.join(
+        f"--- Report r{index} ---\n{report_text}" for index, report_text in enumerate(report_texts)
+    )
+    request_kwargs = _build_extraction_request('')
+    request_kwargs['messages'] = [{"role": "user", "content": BATCH_EXTRACTION_PROMPT.format(reports=reports)}]
+    return request_kwargs
+
+def _parse_batch_weak_areas(raw: str, count: int) -> Dict[int, List[str]]:
+    """Parse a batched extraction response, keeping only well-formed entries by report position."""
+    if '```json' in raw:
+        raw = raw.split('```json')[1].split('```')[0].strip()
+    elif '```' in raw:
+        raw = raw.split('```')[1].strip()
+    
+    try:
+        entries = json.loads(raw).get('reports', [])
+    except (json.JSONDecodeError, AttributeError):
+        return {}
+    
+    parsed = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        report_id = str(entry.get('id', ''))
+        if not report_id.startswith('r') or not report_id[1:].isdigit():
+            continue
+        index = int(report_id[1:])
+        technical_skills = entry.get('technical_skills', [])
+        soft_skills = entry.get('soft_skills', [])
+        if 0 <= index < count and isinstance(technical_skills, list) and isinstance(soft_skills, list):
+            parsed[index] = _skills_from_result(entry)
+    return parsed
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+def _extract_batch_group(report_texts: List[str]) -> List[Any]:
+    """Extract one packed group, splitting and retrying reports whose output did not parse.
+    
+    An API or transport error fails every report in the group instead of splitting it.
+    """
+    if len(report_texts) == 1:
+        try:
+            return [extract_weak_areas(report_texts[0])]
+        except Exception as e:
+            return [e]
+    
+    try:
+        response = _create_chat_completion(_build_batch_extraction_request(report_texts))
+    except Exception as e:
+        # Splitting only multiplies requests against a failing or rate-limited API
+        print(f"Warning: Batched extraction of {len(report_texts)} reports failed: {e}")
+        return [e] * len(report_texts)
+    parsed = _parse_batch_weak_areas((response.choices[0].message.content or '').strip(), len(report_texts))
+    
+    missing = [index for index in range(len(report_texts)) if index not in parsed]
+    if missing:
+        middle = (len(missing) + 1) // 2
+        for half in (missing[:middle], missing[middle:]):
+            if half:
+                for index, skills in zip(half, _extract_batch_group([report_texts[i] for i in half])):
+                    parsed[index] = skills
+    
+    return [parsed[index] for index in range(len(report_texts))]
+
+async def _extract_batch_group_async(report_texts: List[str]) -> List[Any]:
+    """Async version of _extract_batch_group."""
+    if len(report_texts) == 1:
+        try:
+            return [await extract_weak_areas_async(report_texts[0])]
+        except Exception as e:
+            return [e]
+    
+    try:
+        response = await _create_chat_completion_async(_build_batch_extraction_request(report_texts))
+    except Exception as e:
+        # Splitting only multiplies requests against a failing or rate-limited API
+        print(f"Warning: Batched extraction of {len(report_texts)} reports failed: {e}")
+        return [e] * len(report_texts)
+    parsed = _parse_batch_weak_areas((response.choices[0].message.content or '').strip(), len(report_texts))
+    
+    missing = [index for index in range(len(report_texts)) if index not in parsed]
+    if missing:
+        middle = (len(missing) + 1) // 2
+        halves = [half for half in (missing[:middle], missing[middle:]) if half]
+        retried = await asyncio.gather(*[
+            _extract_batch_group_async([report_texts[i] for i in half]) for half in halves
+        ])
+        for half, results in zip(halves, retried):
+            parsed.update(zip(half, results))
+    
+    return [parsed[index] for index in range(len(report_texts))]
+
+def _plan_batch_extraction(report_texts: List[str], token_budget: int = None):
+    """Resolve what can be answered locally and pack the remaining unique reports into groups.
+    
+    Returns:
+        Tuple of (results, pending, groups): results holds skills already known per input
+        position, pending maps each unique cache key to the input positions sharing it,
+        and groups lists the keys to send together in one request
+    """
+    results = [None] * len(report_texts)
+    pending = {}
+    for index, report_text in enumerate(report_texts):
+        skills = _precomputed_weak_areas(report_text)
+        if skills is not None:
+            results[index] = skills
+        else:
+            pending.setdefault(_extraction_cache_key(report_text), []).append(index)
+    
+    keys = list(pending)
+    texts = [report_texts[pending[key][0]] for key in keys]
+    groups = [[keys[i] for i in batch]
+              for batch in _pack_extraction_batches(texts, token_budget or EXTRACTION_BATCH_TOKEN_BUDGET)]
+    return results, pending, groups
+
+def _store_batch_results(results: List[Any], pending: Dict[str, List[int]], report_texts: List[str],
+                         group: List[str], extracted: List[Any]) -> None:
+    """Cache a group's extracted skills and copy them to every input position sharing the report."""
+    for key, skills in zip(group, extracted):
+        if not isinstance(skills, Exception):
+            _remember_weak_areas(report_texts[pending[key][0]], skills)
+        for index in pending[key]:
+            results[index] = list(skills) if not isinstance(skills, Exception) else skills
+
+def extract_weak_areas_batch(report_texts: List[str], token_budget: int = None, max_workers: int = None,
+                             return_exceptions: bool = False) -> List[Any]:
+    """Extract weak areas from many reports, packing several reports into each LLM request.
+    
+    Reports resolved locally (empty, scored, cached or near-duplicates of a
+    cached report) never reach the LLM, and
+    identical reports are sent once. If the model output for some reports in a
+    group does not parse, those reports are split off and retried, down to a
+    single-report extract_weak_areas call.
+    
+    Args:
+        report_texts: Interview analysis report texts
+        token_budget: Estimated prompt tokens per request. If None, uses EXTRACTION_BATCH_TOKEN_BUDGET
+        max_workers: Number of batched requests to run concurrently. If None, uses SEARCH_CONCURRENCY
+        return_exceptions: Return a report's exception in its slot instead of raising it
+        
+    Returns:
+        List of skill lists in input order, as returned by extract_weak_areas
+    """
+    results, pending, groups = _plan_batch_extraction(report_texts, token_budget)
+    
+    if groups:
+        workers = max(1, min(max_workers or SEARCH_CONCURRENCY, len(groups)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_extract_batch_group, [report_texts[pending[key][0]] for key in group])
+                for group in groups
+            ]
+            for group, future in zip(groups, futures):
+                _store_batch_results(results, pending, report_texts, group, future.result())
+    
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+    return results
+
+async def extract_weak_areas_batch_async(report_texts: List[str], token_budget: int = None,
+                                         max_workers: int = None, return_exceptions: bool = False) -> List[Any]:
+    """Async version of extract_weak_areas_batch."""
+    results, pending, groups = await _cache_io(_plan_batch_extraction, report_texts, token_budget)
+    semaphore = asyncio.Semaphore(max(1, max_workers or SEARCH_CONCURRENCY))
+    
+    async def run(group: List[str]) -> List[Any]:
+        async with semaphore:
+            return await _extract_batch_group_async([report_texts[pending[key][0]] for key in group])
+    
+    for group, extracted in zip(groups, await asyncio.gather(*[run(group) for group in groups])):
+        await _cache_io(_store_batch_results, results, pending, report_texts, group, extracted)
+    
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+    return results
+
+def _enhance_query(query: str, is_technical: bool = False) -> str:
+    """Add interview and tutorial terms to a search query."""
+    # Enhance query for technical content
+    enhanced_query = query.lower()
+    if is_technical:
+        # Add common technical interview terms if not already present
+        tech_terms = ["interview", "interview preparation", "coding interview"]
+        if not any(term in enhanced_query for term in tech_terms):
+            enhanced_query = f"{enhanced_query} interview preparation"
+    
+    # Add tutorial/course terms for better results
+    content_terms = ["tutorial", "course", "guide", "explained"]
+    if not any(term in enhanced_query for term in content_terms):
+        enhanced_query = f"{enhanced_query} tutorial"
+    
+    return enhanced_query
+
+# Words the planner and _enhance_query append to a skill, which catalog videos rarely contain
+_QUERY_SUFFIXES = (' interview preparation', ' for technical interviews', ' tutorial')
+
+def _bare_skill(query: str) -> str:
+    """Strip planner and enhancement suffixes from a search query, leaving the skill."""
+    bare = query.strip()
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in _QUERY_SUFFIXES:
+            if bare.lower().endswith(suffix) and len(bare) > len(suffix):
+                bare = bare[:-len(suffix)].rstrip()
+                stripped = True
+    return bare
+
+def _search_params(enhanced_query: str) -> Dict[str, Any]:
+    """Build the search.list parameters shared by the sync and async clients.
+    
+    Page size and page token are added per request by _AdaptiveSearch.
+    """
+    params = {
+        'q': enhanced_query,
+        'part': "snippet",  # Title and description live in the snippet; the id is always returned
+        'type': "video",
+        'relevanceLanguage': "en",
+        'safeSearch': "moderate",
+        'videoDuration': "medium",  # Prefer medium-length videos (4-20 mins)
+        'order': "relevance",
+    }
+    if YOUTUBE_SEARCH_FIELDS:
+        params['fields'] = YOUTUBE_SEARCH_FIELDS
+    return params
+
+class _AcceptanceTracker:
+    """Remember what fraction of search results pass the filters, per query.
+    
+    Rates are an exponentially weighted average over past searches, so the
+    first page can be sized to yield max_results after filtering.
+    """
+    
+    DEFAULT_RATE = 0.5
+    SMOOTHING = 0.3
+    MAX_QUERIES = 10000
+    
+    def __init__(self):
+        self._rates = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def rate(self, key: Tuple[str, bool]) -> float:
+        with self._lock:
+            return self._rates.get(key, self.DEFAULT_RATE)
+    
+    def record(self, key: Tuple[str, bool], accepted: int, examined: int) -> None:
+        if examined <= 0:
+            return
+        with self._lock:
+            previous = self._rates.pop(key, None)
+            observed = accepted / examined
+            self._rates[key] = observed if previous is None else (
+                self.SMOOTHING * observed + (1 - self.SMOOTHING) * previous
+            )
+            while len(self._rates) > self.MAX_QUERIES:
+                self._rates.popitem(last=False)
+
+acceptance_tracker = _AcceptanceTracker()
+
+class _AdaptiveSearch:
+    """Page through search.list results only until enough videos pass the filters.
+    
+    The first page is sized from the query's learned acceptance rate, and
+    further pages (following nextPageToken) are requested only while fewer than
+    max_results videos have been accepted, up to YOUTUBE_MAX_PAGES pages.
+    """
+    
+    # Extra results requested on top of the expected need, so a page is rarely short
+    HEADROOM = 1.5
+    MIN_PAGE_SIZE = 10
+    MAX_PAGE_SIZE = 50  # search.list maximum
+    
+    def __init__(self, params: Dict[str, Any], max_results: int, is_technical: bool):
+        self.params = params
+        self.max_results = max_results
+        self.is_technical = is_technical
+        self.key = (params['q'], is_technical)
+        self.items = []
+        self.pages = 0
+        self.next_page_token = None
+        # Pages beyond the first are the first thing to go when quota runs low
+        self.max_pages = 1 if quota_scheduler.level() >= LEVEL_REDUCED_RESULTS else max(1, YOUTUBE_MAX_PAGES)
+    
+    def _accepted(self) -> int:
+        return len(_filter_search_items(self.items, self.max_results, self.is_technical))
+    
+    def next_params(self) -> Optional[Dict[str, Any]]:
+        """Return the parameters for the next page, or None if no more pages are needed."""
+        if self.pages >= self.max_pages:
+            return None
+        if self.pages > 0 and (not self.next_page_token or self._accepted() >= self.max_results):
+            return None
+        
+        needed = self.max_results - (self._accepted() if self.pages else 0)
+        rate = max(acceptance_tracker.rate(self.key), 0.05)
+        page_size = min(self.MAX_PAGE_SIZE, max(self.MIN_PAGE_SIZE, math.ceil(needed / rate * self.HEADROOM)))
+        
+        page_params = dict(self.params, maxResults=page_size)
+        if self.next_page_token:
+            page_params['pageToken'] = self.next_page_token
+        return page_params
+    
+    def add_page(self, response: Dict[str, Any]) -> None:
+        self.items.extend(response.get("items", []))
+        self.next_page_token = response.get("nextPageToken")
+        self.pages += 1
+    
+    def finish(self) -> List[tuple]:
+        """Record the acceptance rate for this query and return the filtered results."""
+        accepted = 0
+        for item in self.items:
+            try:
+                if _accept_search_item(item, self.is_technical) is not None:
+                    accepted += 1
+            except (KeyError, IndexError):
+                continue
+        acceptance_tracker.record(self.key, accepted, len(self.items))
+        return _filter_search_items(self.items, self.max_results, self.is_technical)
+
+def _search_cache_key(params: Dict[str, Any], max_results: int, is_technical: bool) -> str:
+    """Key a search by its canonical request parameters and filter settings."""
+    return make_cache_key(params, max_results, is_technical)
+
+def _accept_search_item(item: Dict[str, Any], is_technical: bool = False) -> Optional[Tuple[str, str]]:
+    """Return (video_id, title) if a raw search.list item passes the content filters, else None."""
+    video_id = item["id"]["videoId"]
+    title = item["snippet"]["title"]
+    description = item["snippet"].get("description", "").lower()
+    
+    # Skip if title contains unwanted terms
+    skip_terms = ["part ", "episode ", "full course", "full tutorial"]
+    if any(term in title.lower() for term in skip_terms):
+        return None
+    
+    # For technical content, prefer videos with code examples
+    if is_technical and "code" not in description and "example" not in description:
+        return None
+    
+    return video_id, title
+
+def _filter_search_items(items: List[Dict[str, Any]], max_results: int, is_technical: bool = False) -> List[tuple]:
+    """Filter raw search.list items down to (video_title, video_url) tuples."""
+    video_links = []
+    seen_links = set()
+    
+    for item in items:
+        try:
+            accepted = _accept_search_item(item, is_technical)
+            
+            # Skip filtered videos and ones we've seen already
+            if accepted is None or accepted[0] in seen_links:
+                continue
+            
+            video_id, title = accepted
+            link = f"https://www.youtube.com/watch?v={video_id}"
+            video_links.append((title, link))
+            seen_links.add(video_id)
+            
+            # Stop if we have enough results
+            if len(video_links) >= max_results:
+                break
+                
+        except (KeyError, IndexError) as e:
+            print(f"Warning: Error processing video result: {e}")
+            continue
+    
+    return video_links
+
+class _PartialResults(list):
+    """Search results from a search whose later pages failed or ran out of time.
+    
+    They are returned like any other results but never cached, and results
+    cut short by the request deadline mark the recommendations partial.
+    """
+    
+    def __init__(self, videos=(), cut_by_deadline: bool = False):
+        super().__init__(videos)
+        self.cut_by_deadline = cut_by_deadline
+
+def _copy_results(videos: List[tuple], source: List[tuple] = None) -> List[tuple]:
+    """Return a new list of videos, still marked partial if source (default: videos) was."""
+    source = videos if source is None else source
+    if isinstance(source, _PartialResults):
+        return _PartialResults(videos, cut_by_deadline=source.cut_by_deadline)
+    return list(videos)
+
+def _search_youtube_live(query: str, max_results: int, is_technical: bool = False,
+                         refresh: bool = False) -> List[tuple]:
+    """Search the YouTube Data API, through the search cache and quota scheduler.
+    
+    With refresh, cached results are ignored and replaced by a new search.
+    """
+    if not YOUTUBE_API_KEY:
+        print("YouTube API not initialized. Please check your YOUTUBE_API_KEY in .env file.")
+        return []
+    
+    try:
+        enhanced_query = _enhance_query(query, is_technical)
+        params = _search_params(enhanced_query)
+        cache_key = _search_cache_key(params, max_results, is_technical)
+        cached = None if refresh else search_cache.get(cache_key)
+        if cached is not None:
+            return [tuple(video) for video in cached]
+        
+        if quota_scheduler.level() >= LEVEL_CACHE_ONLY:
+            print("YouTube quota nearly exhausted, serving cached results only")
+            return []
+        
+        def fetch() -> List[tuple]:
+            search = _AdaptiveSearch(params, max_results, is_technical)
+            page_params = search.next_params()
+            while page_params is not None:
+                youtube_limiter.acquire(timeout=_upstream_timeout(RATE_LIMIT_MAX_WAIT))
+                quota_ledger.charge('search.list')
+                try:
+                    request = get_youtube_service().search().list(**page_params)
+                    response = get_youtube_pool().execute(request, timeout=_upstream_timeout(YOUTUBE_HTTP_TIMEOUT))
+                except Exception as e:
+                    if not search.pages:
+                        raise
+                    # Keep what earlier pages found, without caching the shortened list
+                    print(f"Warning: Failed to fetch more YouTube results: {e}")
+                    return _PartialResults(search.finish(), cut_by_deadline=_deadline_passed())
+                search.add_page(response)
+                page_params = search.next_params()
+            
+            video_links = search.finish()
+            search_cache.set(cache_key, list(video_links))
+            return video_links
+        
+        return _copy_results(_run_shared(search_inflight, cache_key, fetch))
+        
+    except Exception as e:
+        from googleapiclient.errors import HttpError
+        
+        if _deadline_passed():
+            raise DeadlineExceeded(f"Request deadline exceeded while searching YouTube: {e}") from e
+        if isinstance(e, HttpError):
+            if 'quotaExceeded' in str(e):
+                quota_ledger.exhaust()
+            print(f"YouTube API error: {e}")
+        else:
+            print(f"Unexpected error while searching YouTube: {e}")
+        return []
+
+async def _search_youtube_live_async(query: str, max_results: int, is_technical: bool = False) -> List[tuple]:
+    """Async version of _search_youtube_live that calls the YouTube Data API over httpx."""
+    if not YOUTUBE_API_KEY:
+        print("YouTube API not initialized. Please check your YOUTUBE_API_KEY in .env file.")
+        return []
+    
+    try:
+        enhanced_query = _enhance_query(query, is_technical)
+        params = _search_params(enhanced_query)
+        cache_key = _search_cache_key(params, max_results, is_technical)
+        cached = await _cache_io(search_cache.get, cache_key)
+        if cached is not None:
+            return [tuple(video) for video in cached]
+        
+        if await quota_scheduler.level_async() >= LEVEL_CACHE_ONLY:
+            print("YouTube quota nearly exhausted, serving cached results only")
+            return []
+        
+        async def fetch() -> List[tuple]:
+            search = _AdaptiveSearch(params, max_results, is_technical)
+            page_params = search.next_params()
+            while page_params is not None:
+                await youtube_limiter.acquire_async(timeout=_upstream_timeout(RATE_LIMIT_MAX_WAIT))
+                await quota_ledger.charge_async('search.list')
+                try:
+                    response = await _get_async_http().get(YOUTUBE_SEARCH_URL, params=dict(page_params, key=YOUTUBE_API_KEY),
+                                                           timeout=_upstream_timeout(YOUTUBE_HTTP_TIMEOUT))
+                    response.raise_for_status()
+                except Exception as e:
+                    if not search.pages:
+                        raise
+                    # Keep what earlier pages found, without caching the shortened list
+                    print(f"Warning: Failed to fetch more YouTube results: {e}")
+                    return _PartialResults(search.finish(), cut_by_deadline=_deadline_passed())
+                search.add_page(response.json())
+                page_params = search.next_params()
+            
+            video_links = search.finish()
+            await _cache_io(search_cache.set, cache_key, list(video_links))
+            return video_links
+        
+        return _copy_results(await _run_shared_async(search_inflight, cache_key, fetch))
+        
+    except Exception as e:
+        import httpx
+        
+        if _deadline_passed():
+            raise DeadlineExceeded(f"Request deadline exceeded while searching YouTube: {e}") from e
+        if isinstance(e, httpx.HTTPStatusError):
+            if 'quotaExceeded' in e.response.text:
+                await quota_ledger.exhaust_async()
+            print(f"YouTube API error: {e}")
+        else:
+            print(f"Unexpected error while searching YouTube: {e}")
+        return []
+
+def _search_catalog(query: str, max_results: int, is_technical: bool = False) -> List[tuple]:
+    """Search the local video catalog, applying the same filters as live searches."""
+    catalog = get_catalog()
+    if catalog is None:
+        return []
+    # Terms the catalog has never seen get the highest IDF, so search the skill alone
+    # rather than letting "interview preparation" push real matches under CATALOG_MIN_MATCH
+    items = catalog.search(_bare_skill(query), limit=max_results, min_match=CATALOG_MIN_MATCH,
+                           accept=lambda item: _accept_search_item(item, is_technical) is not None)
+    return _filter_search_items(items, max_results, is_technical)
+
+def _merge_results(first: List[tuple], second: List[tuple], max_results: int) -> List[tuple]:
+    """Append videos from second that are not already in first, up to max_results."""
+    seen = {url for _, url in first}
+    merged = list(first)
+    for title, url in second:
+        if len(merged) >= max_results:
+            break
+        if url not in seen:
+            merged.append((title, url))
+            seen.add(url)
+    return _copy_results(merged, source=second)
+
+def _search_backends(query: str, max_results: int, is_technical: bool = False,
+                     refresh: bool = False) -> List[tuple]:
+    """Search the configured backend, falling back from the catalog to live search."""
+    if SEARCH_BACKEND != 'catalog':
+        return _search_youtube_live(query, max_results, is_technical, refresh=refresh)
+    
+    video_links = _search_catalog(query, max_results, is_technical)
+    if len(video_links) >= max_results or not CATALOG_FALLBACK:
+        return video_links
+    live_links = _search_youtube_live(query, max_results, is_technical, refresh=refresh)
+    return _merge_results(video_links, live_links, max_results)
+
+async def _search_backends_async(query: str, max_results: int, is_technical: bool = False) -> List[tuple]:
+    """Async version of _search_backends."""
+    if SEARCH_BACKEND != 'catalog':
+        return await _search_youtube_live_async(query, max_results, is_technical)
+    
+    # Catalog lookups are in-memory and take milliseconds, so they run inline
+    video_links = _search_catalog(query, max_results, is_technical)
+    if len(video_links) >= max_results or not CATALOG_FALLBACK:
+        return video_links
+    live_links = await _search_youtube_live_async(query, max_results, is_technical)
+    return _merge_results(video_links, live_links, max_results)
+
+def _table_key(query: str, is_technical: bool) -> Tuple[str, bool]:
+    # The enhanced query is stable under re-enhancement, so it can be searched again as is
+    return (_enhance_query(query, is_technical), is_technical)
+
+def _skill_table_keys(skills: List[str]) -> List[Tuple[str, bool]]:
+    """Return the skill table keys of the searches the planner would run for skills."""
+    keys = []
+    for skill in skills:
+        entry = _SearchPlanner().add(skill)
+        if entry is not None:
+            _, query, _, is_technical = entry
+            keys.append(_table_key(query, is_technical))
+    return keys
+
+def _resolve_table_entry(query: str, is_technical: bool) -> Optional[List[tuple]]:
+    """Search again for a skill table entry, bypassing the search cache."""
+    if quota_scheduler.level() >= LEVEL_REDUCED_RESULTS:
+        # Keep serving the current videos until the quota recovers
+        return None
+    return _search_backends(query, SKILL_TABLE_DEPTH, is_technical, refresh=True)
+
+def _skill_table_refresh_budget() -> int:
+    """Return how many skill table entries a refresh may search within SKILL_TABLE_REFRESH_QUOTA."""
+    return int(quota_ledger.remaining() * SKILL_TABLE_REFRESH_QUOTA // QUOTA_COSTS['search.list'])
+
+def search_youtube_videos(query: str, max_results: int = None, is_technical: bool = False) -> List[tuple]:
+    """Search for YouTube videos based on a query, with special handling for technical content.
+    
+    With SKILL_TABLE enabled, skills in the precomputed table are answered by a
+    lookup; other skills are searched and added to the table in the background.
+    With SEARCH_BACKEND=catalog, the local catalog is searched first and live
+    YouTube search only fills in topics the catalog cannot fully answer.
+    
+    Args:
+        query: The search query string
+        max_results: Maximum number of results to return. If None, uses DEFAULT_VIDEO_COUNT
+        is_technical: Whether this is a technical skills search (affects search terms)
+        
+    Returns:
+        List of tuples containing (video_title, video_url)
+    """
+    if not query or not query.strip():
+        print("Error: Empty search query")
+        return []
+        
+    max_results = max_results or DEFAULT_VIDEO_COUNT
+    
+    if not SKILL_TABLE or max_results > SKILL_TABLE_DEPTH:
+        return _search_backends(query, max_results, is_technical)
+    
+    table = get_skill_table()
+    key = _table_key(query, is_technical)
+    video_links = table.get(key)
+    if video_links is None or len(video_links) < max_results:
+        # Search only as deep as this request needs; the table keeps the longest answer seen
+        found = _search_backends(query, max_results, is_technical)
+        if not isinstance(found, _PartialResults) and len(found) > len(video_links or ()):
+            table.submit(key, found)
+        video_links = found
+    return _copy_results(video_links[:max_results], source=video_links)
+
+async def search_youtube_videos_async(query: str, max_results: int = None, is_technical: bool = False) -> List[tuple]:
+    """Async version of search_youtube_videos that calls the YouTube Data API over httpx.
+    
+    Args:
+        query: The search query string
+        max_results: Maximum number of results to return. If None, uses DEFAULT_VIDEO_COUNT
+        is_technical: Whether this is a technical skills search (affects search terms)
+        
+    Returns:
+        List of tuples containing (video_title, video_url)
+    """
+    if not query or not query.strip():
+        print("Error: Empty search query")
+        return []
+        
+    max_results = max_results or DEFAULT_VIDEO_COUNT
+    
+    if not SKILL_TABLE or max_results > SKILL_TABLE_DEPTH:
+        return await _search_backends_async(query, max_results, is_technical)
+    
+    table = get_skill_table()
+    key = _table_key(query, is_technical)
+    video_links = table.get(key)
+    if video_links is None or len(video_links) < max_results:
+        found = await _search_backends_async(query, max_results, is_technical)
+        if not isinstance(found, _PartialResults) and len(found) > len(video_links or ()):
+            table.submit(key, found)
+        video_links = found
+    return _copy_results(video_links[:max_results], source=video_links)
+
+VIDEO_DETAIL_PARTS = 'snippet,contentDetails,statistics'
+VIDEO_DETAIL_FIELDS = 'items(id,snippet/publishedAt,contentDetails/duration,statistics(viewCount,likeCount))'
+VIDEOS_PER_LOOKUP = 50  # videos.list accepts up to 50 IDs per call
+ISO_DURATION_PATTERN = re.compile(r'^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+# Weight of each signal in a video's rank score; each signal is scaled to 0-1
+RANKING_WEIGHTS = {'duration': 0.3, 'popularity': 0.3, 'approval': 0.2, 'recency': 0.2}
+
+def _video_id(url: str) -> str:
+    return url.rsplit('v=', 1)[-1]
+
+def _parse_duration(value: Optional[str]) -> Optional[int]:
+    """Convert an ISO 8601 duration such as PT12M30S to seconds."""
+    match = ISO_DURATION_PATTERN.match(value or '')
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def _video_details(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a videos.list item to the fields used for ranking."""
+    statistics = item.get('statistics', {})
+    return {
+        'duration': _parse_duration(item.get('contentDetails', {}).get('duration')),
+        'views': int(statistics.get('viewCount', 0)),
+        'likes': int(statistics.get('likeCount', 0)),
+        'published_at': item.get('snippet', {}).get('publishedAt'),
+    }
+
+def _video_score(details: Dict[str, Any], now: datetime) -> float:
+    """Score a video between 0 and 1 from its length, popularity, like rate and age."""
+    duration = details.get('duration')
+    if duration is None:
+        duration_fit = 0.5
+    elif duration < 120:
+        duration_fit = 0.1  # Shorts and trailers rarely teach anything
+    elif duration <= 1800:
+        duration_fit = 1.0
+    elif duration <= 3600:
+        duration_fit = 0.6
+    else:
+        duration_fit = 0.3
+    
+    views = details.get('views', 0)
+    popularity = min(1.0, math.log10(views + 1) / 7)  # 10M views scores 1
+    approval = min(1.0, details.get('likes', 0) / views / 0.04) if views else 0.0  # 4% like rate scores 1
+    
+    recency = 0.5
+    if details.get('published_at'):
+        try:
+            published_at = datetime.fromisoformat(details['published_at'].replace('Z', '+00:00'))
+            recency = 0.5 ** (max(0, (now - published_at).days) / 730)  # Halves every two years
+        except ValueError:
+            pass
+    
+    return (RANKING_WEIGHTS['duration'] * duration_fit + RANKING_WEIGHTS['popularity'] * popularity +
+            RANKING_WEIGHTS['approval'] * approval + RANKING_WEIGHTS['recency'] * recency)
+
+def _video_cache_key(video_id: str) -> str:
+    return make_cache_key(video_id, VIDEO_DETAIL_FIELDS)
+
+def _cached_video_details(video_ids: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Split video_ids into cached details and IDs that still need a lookup."""
+    details = {}
+    missing = []
+    for video_id in dict.fromkeys(video_ids):
+        cached = video_cache.get(_video_cache_key(video_id))
+        if cached is None:
+            missing.append(video_id)
+        elif cached:
+            details[video_id] = cached
+    return details, missing
+
+def _store_video_details(video_ids: List[str], items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Cache the details returned for one lookup; IDs the API did not return are cached as empty."""
+    found = {}
+    for item in items:
+        try:
+            found[item['id']] = _video_details(item)
+        except (KeyError, ValueError):
+            continue
+    for video_id in video_ids:
+        video_cache.set(_video_cache_key(video_id), found.get(video_id, {}))
+    return found
+
+def _lookup_chunks(video_ids: List[str]) -> List[List[str]]:
+    return [video_ids[start:start + VIDEOS_PER_LOOKUP] for start in range(0, len(video_ids), VIDEOS_PER_LOOKUP)]
+
+def _is_quota_exceeded(error: Exception) -> bool:
+    response = getattr(error, 'response', None)
+    return 'quotaExceeded' in str(error) or 'quotaExceeded' in getattr(response, 'text', '')
+
+def fetch_video_details(video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Look up duration, view and like counts and publish date for videos.
+    
+    Videos already in the video cache are not fetched again, and the rest are
+    resolved with one videos.list call (1 quota unit) per 50 IDs. When the
+    quota is nearly exhausted, only cached details are returned.
+    
+    Args:
+        video_ids: YouTube video IDs, possibly with duplicates
+        
+    Returns:
+        Dictionary mapping video IDs to their details; videos that could not
+        be looked up are left out
+    """
+    details, missing = _cached_video_details(video_ids)
+    if not missing or not YOUTUBE_API_KEY or quota_scheduler.level() >= LEVEL_CACHE_ONLY:
+        return details
+    
+    for chunk in _lookup_chunks(missing):
+        try:
+            youtube_limiter.acquire(timeout=_upstream_timeout(RATE_LIMIT_MAX_WAIT))
+            quota_ledger.charge('videos.list')
+            request = get_youtube_service().videos().list(
+                part=VIDEO_DETAIL_PARTS, id=','.join(chunk), fields=VIDEO_DETAIL_FIELDS
+            )
+            response = get_youtube_pool().execute(request, timeout=_upstream_timeout(YOUTUBE_HTTP_TIMEOUT))
+        except Exception as e:
+            if _is_quota_exceeded(e):
+                quota_ledger.exhaust()
+            print(f"Warning: Failed to look up YouTube video details: {e}")
+            break
+        details.update(_store_video_details(chunk, response.get('items', [])))
+    
+    return details
+
+async def fetch_video_details_async(video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Async version of fetch_video_details that runs the lookups concurrently over httpx."""
+    details, missing = await _cache_io(_cached_video_details, video_ids)
+    if not missing or not YOUTUBE_API_KEY or await quota_scheduler.level_async() >= LEVEL_CACHE_ONLY:
+        return details
+    
+    async def lookup(chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+        await youtube_limiter.acquire_async(timeout=_upstream_timeout(RATE_LIMIT_MAX_WAIT))
+        await quota_ledger.charge_async('videos.list')
+        response = await _get_async_http().get(YOUTUBE_VIDEOS_URL, params={
+            'part': VIDEO_DETAIL_PARTS,
+            'id': ','.join(chunk),
+            'fields': VIDEO_DETAIL_FIELDS,
+            'key': YOUTUBE_API_KEY,
+        }, timeout=_upstream_timeout(YOUTUBE_HTTP_TIMEOUT))
+        response.raise_for_status()
+        return await _cache_io(_store_video_details, chunk, response.json().get('items', []))
+    
+    for found in await asyncio.gather(*[lookup(chunk) for chunk in _lookup_chunks(missing)], return_exceptions=True):
+        if isinstance(found, Exception):
+            if _is_quota_exceeded(found):
+                await quota_ledger.exhaust_async()
+            print(f"Warning: Failed to look up YouTube video details: {found}")
+            continue
+        details.update(found)
+    
+    return details
+
+def rank_videos(videos: List[tuple], details: Dict[str, Dict[str, Any]], max_results: int = None) -> List[tuple]:
+    """Order search candidates by their details and keep the best max_results.
+    
+    Videos without details are ranked last, and ties keep YouTube's relevance order.
+    
+    Args:
+        videos: List of (video_title, video_url) tuples in relevance order
+        details: Video details from fetch_video_details
+        max_results: Number of videos to keep. If None, uses DEFAULT_VIDEO_COUNT
+        
+    Returns:
+        List of (video_title, video_url) tuples, best first
+    """
+    now = datetime.now(timezone.utc)
+    scores = {}
+    for _, url in videos:
+        video_details = details.get(_video_id(url))
+        scores[url] = _video_score(video_details, now) if video_details else -1.0
+    ranked = sorted(videos, key=lambda video: scores[video[1]], reverse=True)[:max_results or DEFAULT_VIDEO_COUNT]
+    return _copy_results(ranked, source=videos)
+
+def _candidate_count(max_results: int, enrich: bool) -> int:
+    """Number of search results to fetch for a skill, over-fetching when they will be ranked."""
+    if not enrich:
+        return max_results
+    return (max_results or DEFAULT_VIDEO_COUNT) * max(1, ENRICH_CANDIDATE_FACTOR)
+
+def _collect_video_ids(results: List[Optional[List[tuple]]]) -> List[str]:
+    return [_video_id(url) for videos in results if videos for _, url in videos]
+
+def _rank_results(plan: List[Tuple[str, str, int, bool]], results: List[Optional[List[tuple]]],
+                  details: Dict[str, Dict[str, Any]]) -> List[Optional[List[tuple]]]:
+    """Rank each planned search's candidates and trim them to the planned count."""
+    return [
+        None if videos is None else rank_videos(videos, details, max_results)
+        for (_, _, max_results, _), videos in zip(plan, results)
+    ]
+
+class _SearchPlanner:
+    """Turn skills into searches one at a time, in the order they are extracted.
+    
+    Technical skills come first in the final plan, followed by up to three soft
+    skills. If no technical skill was added, finish() adds a default one. When
+    the YouTube quota runs low, fewer soft skills and videos are planned.
+    Skills are canonicalized first, and skills that fold onto one already
+    planned are skipped.
+    """
+    
+    TECHNICAL_TERMS = ['programming', 'coding', 'algorithm', 'data structure', 
+                       'system design', 'technical', 'computer science', 'software']
+    MAX_SOFT_SKILLS = 3  # Limit to top 3 soft skills
+    
+    def __init__(self, max_videos_per_skill: int = None):
+        quota_level = quota_scheduler.level()
+        self.max_videos_per_skill = 1 if quota_level >= LEVEL_REDUCED_RESULTS else max_videos_per_skill
+        self.max_soft_skills = 1 if quota_level >= LEVEL_FEWER_SOFT_SKILLS else self.MAX_SOFT_SKILLS
+        self.technical = []
+        self.soft = []
+        self.planned = set()
+    
+    @property
+    def plan(self) -> List[Tuple[str, str, int, bool]]:
+        return self.technical + self.soft
+    
+    def add(self, skill: str) -> Optional[Tuple[str, str, int, bool]]:
+        """Plan a search for skill, returning the new entry or None if the skill is skipped."""
+        if not skill or not skill.strip():
+            return None
+        
+        if SKILL_CANONICALIZATION:
+            skill = skill_canonicalizer.canonicalize(skill)
+        skill_lower = skill.lower()
+        if skill_lower in self.planned:
+            return None
+        
+        if any(term in skill_lower for term in self.TECHNICAL_TERMS):
+            entry = (f"{skill} (Technical)", f"{skill} interview preparation", self.max_videos_per_skill, True)
+            self.technical.append(entry)
+            self.planned.add(skill_lower)
+            return entry
+        
+        # Soft skills videos only if we have space
+        if len(self.soft) >= self.max_soft_skills:
+            return None
+        soft_max_results = max(1, (self.max_videos_per_skill or DEFAULT_VIDEO_COUNT) // 2)
+        entry = (skill, f"{skill} for technical interviews", soft_max_results, False)
+        self.soft.append(entry)
+        self.planned.add(skill_lower)
+        return entry
+    
+    def finish(self) -> Optional[Tuple[str, str, int, bool]]:
+        """Add the default technical search if no technical skill was planned."""
+        if self.technical:
+            return None
+        return self.add("Technical Interview Skills")
+
+def _build_search_plan(skills: List[str], max_videos_per_skill: int = None) -> List[Tuple[str, str, int, bool]]:
+    """Turn extracted skills into the ordered list of searches to run.
+    
+    Args:
+        skills: Skills returned by extract_weak_areas
+        max_videos_per_skill: Maximum number of videos per skill. If None, uses DEFAULT_VIDEO_COUNT
+        
+    Returns:
+        List of (label, query, max_results, is_technical) tuples in display order
+    """
+    planner = _SearchPlanner(max_videos_per_skill)
+    for skill in skills:
+        planner.add(skill)
+    planner.finish()
+    return planner.plan
+
+def _results_by_deadline(futures: List[Any]) -> List[Optional[List[tuple]]]:
+    """Wait for search futures until the request deadline, with None for those not finished by then."""
+    left = _time_left()
+    done, _ = wait(futures, timeout=None if left is None else max(0.0, left))
+    results = []
+    for future in futures:
+        if future not in done or future.cancelled() or isinstance(future.exception(), DeadlineExceeded):
+            results.append(None)
+        else:
+            results.append(future.result())
+    return results
+
+async def _results_by_deadline_async(tasks: List['asyncio.Future']) -> List[Optional[List[tuple]]]:
+    """Async version of _results_by_deadline that cancels the tasks still running at the deadline."""
+    if not tasks:
+        return []
+    left = _time_left()
+    done, pending = await asyncio.wait(tasks, timeout=None if left is None else max(0.0, left))
+    for task in pending:
+        task.cancel()
+    results = []
+    for task in tasks:
+        if task not in done or task.cancelled() or isinstance(task.exception(), DeadlineExceeded):
+            results.append(None)
+        else:
+            results.append(task.result())
+    return results
+
+class Recommendations(dict):
+    """Mapping of skill labels to videos that also records skills cut off by a deadline.
+    
+    Attributes:
+        pending: Labels of skills whose searches did not finish before the request deadline
+        partial: Whether the request deadline cut the recommendations short
+    """
+    
+    def __init__(self, *args, pending: List[str] = None, partial: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pending = list(pending or [])
+        self.partial = partial or bool(self.pending)
+
+def _run_search_plan(plan: List[Tuple[str, str, int, bool]], max_workers: int = None,
+                     enrich: bool = False) -> Recommendations:
+    """Run every search in the plan and assemble results in plan order.
+    
+    Args:
+        plan: List of (label, query, max_results, is_technical) tuples
+        max_workers: Number of concurrent searches. If None, uses SEARCH_CONCURRENCY.
+                     A value of 1 runs the searches one after another.
+        enrich: Over-fetch candidates and rank them with one batched details lookup
+                     
+    Returns:
+        Recommendations mapping skill labels to list of (video_title, video_url) tuples.
+        Searches cut off by the request deadline are listed in its pending attribute.
+    """
+    max_workers = max_workers or SEARCH_CONCURRENCY
+    
+    if max_workers <= 1 or len(plan) <= 1:
+        results = []
+        for _, query, max_results, is_technical in plan:
+            try:
+                results.append(search_youtube_videos(
+                    query, max_results=_candidate_count(max_results, enrich), is_technical=is_technical
+                ))
+            except DeadlineExceeded:
+                results.append(None)
+    else:
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(plan)))
+        try:
+            futures = [
+                _submit(executor, search_youtube_videos, query,
+                        max_results=_candidate_count(max_results, enrich), is_technical=is_technical)
+                for _, query, max_results, is_technical in plan
+            ]
+            results = _results_by_deadline(futures)
+        finally:
+            # Do not wait for searches still running past the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    if enrich:
+        results = _rank_results(plan, results, fetch_video_details(_collect_video_ids(results)))
+    return _assemble_recommendations(plan, results)
 
-# Initialize YouTube API
-youtube = None
-if os.getenv('YOUTUBE_API_KEY'):
-    try:
-        youtube = build("youtube", "v3", developerKey=os.getenv('YOUTUBE_API_KEY'))
-    except Exception as e:
-        print(f"Warning: Failed to initialize YouTube API: {e}")
+async def _run_search_plan_async(plan: List[Tuple[str, str, int, bool]], max_workers: int = None,
+                                 enrich: bool = False) -> Recommendations:
+    """Async version of _run_search_plan bounded by a semaphore instead of a thread pool."""
+    semaphore = asyncio.Semaphore(max(1, max_workers or SEARCH_CONCURRENCY))
+    
+    async def run(query: str, max_results: int, is_technical: bool) -> List[tuple]:
+        async with semaphore:
+            return await search_youtube_videos_async(
+                query, max_results=_candidate_count(max_results, enrich), is_technical=is_technical
+            )
+    
+    results = await _results_by_deadline_async([
+        asyncio.ensure_future(run(query, max_results, is_technical))
+        for _, query, max_results, is_technical in plan
+    ])
+    if enrich:
+        results = _rank_results(plan, results, await fetch_video_details_async(_collect_video_ids(results)))
+    return _assemble_recommendations(plan, results)
 
-def extract_weak_areas(report_text: str) -> List[str]:
-    """Extract weak areas from the report with focus on technical skills."""
+def _run_streamed_extraction(report_text: str, max_videos_per_skill: int = None,
+                             max_workers: int = None, enrich: bool = False) -> Recommendations:
+    """Search for each skill while the LLM is still generating the rest of the list."""
+    planner = _SearchPlanner(max_videos_per_skill)
+    futures = {}
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers or SEARCH_CONCURRENCY))
     try:
-        if not report_text.strip():
-            print("Warning: Empty report text provided, using default skills")
-            return ["Technical Interview Skills"] + DEFAULT_SKILLS
-            
-        prompt = """
-        Analyze this interview report and identify specific technical areas that need improvement.
-        Focus on programming languages, frameworks, and technical concepts mentioned.
-        
-        Report:
-        {report_text}
-        
-        Return a JSON object with:
-        {{
-            "technical_skills": ["specific technical topics"],
-            "soft_skills": ["other areas"]
-        }}
-        """.format(report_text=report_text)
+        def submit(entry: Optional[Tuple[str, str, int, bool]]) -> None:
+            if entry is not None and entry not in futures:
+                _, query, max_results, is_technical = entry
+                futures[entry] = _submit(
+                    executor, search_youtube_videos, query,
+                    max_results=_candidate_count(max_results, enrich), is_technical=is_technical
+                )
         
-        # First try with response_format for modern models
+        extracted = True
         try:
-            response = client.chat.completions.create(
-                model=DEFAULT_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=DEFAULT_TEMPERATURE,
-                response_format={"type": "json_object"} if 'gpt-4' in DEFAULT_MODEL.lower() or 'gpt-3.5-turbo' in DEFAULT_MODEL.lower() else None
-            )
-        except Exception as e:
-            if 'response_format' in str(e):
-                # Retry without response_format if it's not supported
-                response = client.chat.completions.create(
-                    model=DEFAULT_MODEL,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=DEFAULT_TEMPERATURE
-                )
-            else:
+            for skill in stream_weak_areas(report_text):
+                submit(planner.add(skill))
+            submit(planner.finish())
+        except Exception:
+            # Past the deadline, keep the searches for skills that were already emitted
+            if not _deadline_passed():
                 raise
+            extracted = False
+        
+        plan = planner.plan
+        results = _results_by_deadline([futures[entry] for entry in plan])
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    if enrich:
+        results = _rank_results(plan, results, fetch_video_details(_collect_video_ids(results)))
+    recommendations = _assemble_recommendations(plan, results)
+    recommendations.partial = recommendations.partial or not extracted
+    return recommendations
+
+async def _run_streamed_extraction_async(report_text: str, max_videos_per_skill: int = None,
+                                         max_workers: int = None, enrich: bool = False) -> Recommendations:
+    """Async version of _run_streamed_extraction."""
+    planner = _SearchPlanner(max_videos_per_skill)
+    semaphore = asyncio.Semaphore(max(1, max_workers or SEARCH_CONCURRENCY))
+    tasks = {}
+    
+    async def run(query: str, max_results: int, is_technical: bool) -> List[tuple]:
+        async with semaphore:
+            return await search_youtube_videos_async(
+                query, max_results=_candidate_count(max_results, enrich), is_technical=is_technical
+            )
+    
+    def submit(entry: Optional[Tuple[str, str, int, bool]]) -> None:
+        if entry is not None and entry not in tasks:
+            tasks[entry] = asyncio.ensure_future(run(*entry[1:]))
+    
+    extracted = True
+    try:
+        async for skill in astream_weak_areas(report_text):
+            submit(planner.add(skill))
+        submit(planner.finish())
+    except Exception:
+        # Past the deadline, keep the searches for skills that were already emitted
+        if not _deadline_passed():
+            for task in tasks.values():
+                task.cancel()
+            raise
+        extracted = False
+    
+    plan = planner.plan
+    results = await _results_by_deadline_async([tasks[entry] for entry in plan])
+    if enrich:
+        results = _rank_results(plan, results, await fetch_video_details_async(_collect_video_ids(results)))
+    recommendations = _assemble_recommendations(plan, results)
+    recommendations.partial = recommendations.partial or not extracted
+    return recommendations
+
+def _assemble_recommendations(plan: List[Tuple[str, str, int, bool]],
+                              results: List[Optional[List[tuple]]]) -> Recommendations:
+    """Pair search results with their plan labels, dropping skills with no videos.
+    
+    A result of None marks a search the request deadline cut off, and results
+    whose later pages it cut off mark the recommendations partial as well.
+    """
+    recommendations = Recommendations()
+    cut_short = False
+    for (label, _, _, _), videos in zip(plan, results):
+        if videos is None:
+            recommendations.pending.append(label)
+            continue
+        cut_short = cut_short or getattr(videos, 'cut_by_deadline', False)
+        if videos:
+            recommendations[label] = list(videos)
+    recommendations.partial = bool(recommendations.pending) or cut_short
+    
+    return recommendations
 
-        raw = response.choices[0].message.content.strip()
+def generate_video_recommendations(report_text: str, max_videos_per_skill: int = None,
+                                   max_workers: int = None,
+                                   stream_extraction: bool = None,
+                                   enrich: bool = None,
+                                   deadline_ms: int = None) -> Recommendations:
+    """Generate video recommendations based on the report with focus on technical content.
+    
+    Args:
+        report_text: The interview analysis report text
+        max_videos_per_skill: Maximum number of videos to return per skill. 
+                            If None, uses DEFAULT_VIDEO_COUNT
+        max_workers: Number of per-skill searches to run concurrently.
+                     If None, uses SEARCH_CONCURRENCY
+        stream_extraction: Start each search as soon as the LLM emits its skill.
+                           If None, uses STREAM_EXTRACTION
+        enrich: Rank a larger set of candidates by duration, views, likes and age.
+                If None, uses ENRICH_RESULTS
+        deadline_ms: Time budget in milliseconds for every upstream call combined.
+                     If None, calls are only bounded by their own timeouts
+                            
+    Returns:
+        Recommendations mapping skills to list of (video_title, video_url) tuples.
+        If the deadline cuts the searches short, it holds the skills resolved
+        by then, with partial set and the rest of the skills in pending.
+    """
+    if not report_text or not report_text.strip():
+        raise ValueError("Report text cannot be empty")
+    
+    enrich = ENRICH_RESULTS if enrich is None else enrich
+    with _deadline_scope(deadline_ms):
+        if STREAM_EXTRACTION if stream_extraction is None else stream_extraction:
+            return _run_streamed_extraction(report_text, max_videos_per_skill, max_workers, enrich=enrich)
         
-        # Try to parse as JSON, fallback to extracting skills from text if needed
+        # Extract skills from the report
         try:
-            # Clean the response
-            if '```json' in raw:
-                raw = raw.split('```json')[1].split('```')[0].strip()
-            elif '```' in raw:
-                raw = raw.split('```')[1].strip()
-                
-            result = json.loads(raw)
-            
-            # Extract both technical and soft skills
-            technical_skills = result.get('technical_skills', [])
-            soft_skills = result.get('soft_skills', [])
-            
-            # If no technical skills found, add a default one
-            if not technical_skills:
-                technical_skills = ["Technical Interview Skills"]
-                
-            # Combine them with technical skills first
-            return technical_skills + soft_skills
-            
-        except (json.JSONDecodeError, AttributeError):
-            # Fallback parsing if JSON parsing fails
-            print("Warning: Could not parse response as JSON. Attempting to extract skills from text...")
-            technical_skills = []
-            soft_skills = []
-            
-            # Look for technical skills first
-            for line in raw.split('\n'):
-                line = line.lower().strip()
-                if any(term in line for term in ['data struct', 'algorithm', 'system design', 'coding', 'programming', 'technical', 'computer science']):
-                    skill = ' '.join(word.capitalize() for word in line.split())
-                    if skill and skill not in technical_skills and len(skill) < 50:
-                        technical_skills.append(skill)
-            
-            # If no technical skills found, add a default one
-            if not technical_skills:
-                technical_skills = ["Technical Interview Skills"]
-                
-            # Get other skills
-            for line in raw.split('\n'):
-                line = line.strip()
-                if line and len(line) < 50 and line[0].isupper():
-                    skill = line.split(':', 1)[0].strip()
-                    if skill and skill not in technical_skills and skill not in soft_skills and len(skill) < 50:
-                        soft_skills.append(skill)
-                        
-            return technical_skills + (soft_skills if soft_skills else DEFAULT_SKILLS)
+            skills = extract_weak_areas(report_text)
+        except Exception:
+            if _deadline_passed():
+                return Recommendations(partial=True)
+            raise
+        if not skills:
+            print("No skills found in the report, using default technical skills")
+            skills = ["Technical Interview Skills"]
         
-    except Exception as e:
-        print(f"Error extracting weak areas: {e}")
-        raise Exception("Failed to extract weak areas from the report")
+        plan = _build_search_plan(skills, max_videos_per_skill)
+        return _run_search_plan(plan, max_workers=max_workers, enrich=enrich)
 
-def search_youtube_videos(query: str, max_results: int = None, is_technical: bool = False) -> List[tuple]:
-    """Search for YouTube videos based on a query, with special handling for technical content.
+async def generate_video_recommendations_async(report_text: str, max_videos_per_skill: int = None,
+                                               max_workers: int = None,
+                                               stream_extraction: bool = None,
+                                               enrich: bool = None,
+                                               deadline_ms: int = None) -> Recommendations:
+    """Async version of generate_video_recommendations for use inside an event loop.
     
     Args:
-        query: The search query string
-        max_results: Maximum number of results to return. If None, uses DEFAULT_VIDEO_COUNT
-        is_technical: Whether this is a technical skills search (affects search terms)
-        
+        report_text: The interview analysis report text
+        max_videos_per_skill: Maximum number of videos to return per skill. 
+                            If None, uses DEFAULT_VIDEO_COUNT
+        max_workers: Number of per-skill searches to run concurrently.
+                     If None, uses SEARCH_CONCURRENCY
+        stream_extraction: Start each search as soon as the LLM emits its skill.
+                           If None, uses STREAM_EXTRACTION
+        enrich: Rank a larger set of candidates by duration, views, likes and age.
+                If None, uses ENRICH_RESULTS
+        deadline_ms: Time budget in milliseconds for every upstream call combined.
+                     If None, calls are only bounded by their own timeouts
+                            
     Returns:
-        List of tuples containing (video_title, video_url)
+        Recommendations mapping skills to list of (video_title, video_url) tuples,
+        partial if the deadline cut the searches short
     """
-    if not query or not query.strip():
-        print("Error: Empty search query")
-        return []
+    if not report_text or not report_text.strip():
+        raise ValueError("Report text cannot be empty")
+    
+    enrich = ENRICH_RESULTS if enrich is None else enrich
+    with _deadline_scope(deadline_ms):
+        if STREAM_EXTRACTION if stream_extraction is None else stream_extraction:
+            return await _run_streamed_extraction_async(report_text, max_videos_per_skill, max_workers, enrich=enrich)
         
-    max_results = max_results or DEFAULT_VIDEO_COUNT
+        # Extract skills from the report
+        try:
+            skills = await extract_weak_areas_async(report_text)
+        except Exception:
+            if _deadline_passed():
+                return Recommendations(partial=True)
+            raise
+        if not skills:
+            print("No skills found in the report, using default technical skills")
+            skills = ["Technical Interview Skills"]
+        
+        plan = _build_search_plan(skills, max_videos_per_skill)
+        return await _run_search_plan_async(plan, max_workers=max_workers, enrich=enrich)
+
+def _search_dedupe_key(query: str, max_results: int, is_technical: bool) -> Tuple[str, int, bool]:
+    """Identify searches that would send the same request, e.g. differing only in case."""
+    return (_enhance_query(query, is_technical), max_results or DEFAULT_VIDEO_COUNT, is_technical)
+
+def _batch_report_error(report_text: Any) -> Optional[Exception]:
+    """Return why a report in a batch cannot be processed, or None if it can."""
+    if not isinstance(report_text, str):
+        return ValueError("Report text must be a string")
+    if not report_text.strip():
+        return ValueError("Report text cannot be empty")
+    return None
+
+def generate_batch_recommendations(reports: List[str], max_videos_per_skill: int = None,
+                                   max_workers: int = None, enrich: bool = None) -> List[Dict[str, Any]]:
+    """Generate video recommendations for many reports, searching each unique skill once.
     
-    if not youtube:
-        print("YouTube API not initialized. Please check your YOUTUBE_API_KEY in .env file.")
-        return []
+    Skills are extracted for every report first, with several reports packed
+    into each LLM request, then identical searches across the whole batch are
+    collapsed so each one runs a single time. With enrichment, the candidates
+    of every search in the batch share the same batched details lookups.
     
-    try:
-        # Enhance query for technical content
-        enhanced_query = query.lower()
-        if is_technical:
-            # Add common technical interview terms if not already present
-            tech_terms = ["interview", "interview preparation", "coding interview"]
-            if not any(term in enhanced_query for term in tech_terms):
-                enhanced_query = f"{enhanced_query} interview preparation"
-        
-        # Add tutorial/course terms for better results
-        content_terms = ["tutorial", "course", "guide", "explained"]
-        if not any(term in enhanced_query for term in content_terms):
-            enhanced_query = f"{enhanced_query} tutorial"
-        
-        # Add duration filter for more in-depth content
-        request = youtube.search().list(
-            q=enhanced_query,
-            part="snippet",
-            type="video",
-            maxResults=max(10, max_results * 2),  # Get more results to filter
-            relevanceLanguage="en",
-            safeSearch="moderate",
-            videoDuration="medium",  # Prefer medium-length videos (4-20 mins)
-            order="relevance"
-        )
-        
-        response = request.execute()
+    Args:
+        reports: Interview analysis report texts
+        max_videos_per_skill: Maximum number of videos to return per skill. 
+                            If None, uses DEFAULT_VIDEO_COUNT
+        max_workers: Number of extractions and searches to run concurrently.
+                     If None, uses SEARCH_CONCURRENCY
+        enrich: Rank a larger set of candidates by duration, views, likes and age.
+                If None, uses ENRICH_RESULTS
+                     
+    Returns:
+        One dictionary per report, in input order, with 'status' set to 'success'
+        and 'recommendations' mapping skills to (video_title, video_url) tuples,
+        or 'status' set to 'error' and a 'message'
+    """
+    max_workers = max(1, max_workers or SEARCH_CONCURRENCY)
+    enrich = ENRICH_RESULTS if enrich is None else enrich
+    
+    # Pack reports into as few LLM requests as possible
+    invalid = [_batch_report_error(report_text) for report_text in reports]
+    valid = [index for index, error in enumerate(invalid) if error is None]
+    extracted = dict(zip(valid, extract_weak_areas_batch(
+        [reports[index] for index in valid], max_workers=max_workers, return_exceptions=True
+    )))
+    
+    plans = []
+    errors = {}
+    for index in range(len(reports)):
+        skills = extracted.get(index, invalid[index])
+        if isinstance(skills, Exception):
+            errors[index] = str(skills)
+            plans.append([])
+        else:
+            plans.append(_build_search_plan(skills or ["Technical Interview Skills"], max_videos_per_skill))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Run each distinct search once for the whole batch
+        searches = {}
+        for plan in plans:
+            for _, query, max_results, is_technical in plan:
+                key = _search_dedupe_key(query, _candidate_count(max_results, enrich), is_technical)
+                if key not in searches:
+                    searches[key] = executor.submit(
+                        search_youtube_videos, query,
+                        max_results=_candidate_count(max_results, enrich), is_technical=is_technical
+                    )
+        found = {key: future.result() for key, future in searches.items()}
+    
+    details = fetch_video_details(_collect_video_ids(list(found.values()))) if enrich else {}
+    
+    results = []
+    for index, plan in enumerate(plans):
+        if index in errors:
+            results.append({'status': 'error', 'message': errors[index]})
+            continue
+        videos = [found[_search_dedupe_key(query, _candidate_count(max_results, enrich), is_technical)]
+                  for _, query, max_results, is_technical in plan]
+        if enrich:
+            videos = _rank_results(plan, videos, details)
+        results.append({'status': 'success', 'recommendations': _assemble_recommendations(plan, videos)})
+    
+    return results
 
-        video_links = []
-        seen_links = set()
-        
-        for item in response.get("items", []):
-            try:
-                video_id = item["id"]["videoId"]
-                title = item["snippet"]["title"]
-                description = item["snippet"].get("description", "").lower()
-                
-                # Skip if we've seen this video already
-                if video_id in seen_links:
-                    continue
-                
-                # Skip if title contains unwanted terms
-                skip_terms = ["part ", "episode ", "full course", "full tutorial"]
-                if any(term in title.lower() for term in skip_terms):
-                    continue
-                
-                # For technical content, prefer videos with code examples
-                if is_technical and "code" not in description and "example" not in description:
-                    continue
-                
-                link = f"https://www.youtube.com/watch?v={video_id}"
-                video_links.append((title, link))
-                seen_links.add(video_id)
-                
-                # Stop if we have enough results
-                if len(video_links) >= max_results:
-                    break
-                    
-            except (KeyError, IndexError) as e:
-                print(f"Warning: Error processing video result: {e}")
-                continue
-        
-        return video_links
-        
-    except HttpError as e:
-        print(f"YouTube API error: {e}")
-        return []
-    except Exception as e:
-        print(f"Unexpected error while searching YouTube: {e}")
-        return []
+async def generate_batch_recommendations_async(reports: List[str], max_videos_per_skill: int = None,
+                                               max_workers: int = None, enrich: bool = None) -> List[Dict[str, Any]]:
+    """Async version of generate_batch_recommendations for use inside an event loop."""
+    enrich = ENRICH_RESULTS if enrich is None else enrich
+    semaphore = asyncio.Semaphore(max(1, max_workers or SEARCH_CONCURRENCY))
+    
+    async def search(query: str, max_results: int, is_technical: bool) -> List[tuple]:
+        async with semaphore:
+            return await search_youtube_videos_async(query, max_results=max_results, is_technical=is_technical)
+    
+    # Pack reports into as few LLM requests as possible
+    invalid = [_batch_report_error(report_text) for report_text in reports]
+    valid = [index for index, error in enumerate(invalid) if error is None]
+    extracted = dict(zip(valid, await extract_weak_areas_batch_async(
+        [reports[index] for index in valid], max_workers=max_workers, return_exceptions=True
+    )))
+    extractions = [extracted.get(index, invalid[index]) for index in range(len(reports))]
+    plans = [[] if isinstance(skills, Exception)
+             else _build_search_plan(skills or ["Technical Interview Skills"], max_videos_per_skill)
+             for skills in extractions]
+    
+    # Run each distinct search once for the whole batch
+    searches = {}
+    for plan in plans:
+        for _, query, max_results, is_technical in plan:
+            key = _search_dedupe_key(query, _candidate_count(max_results, enrich), is_technical)
+            if key not in searches:
+                searches[key] = (query, _candidate_count(max_results, enrich), is_technical)
+    keys = list(searches)
+    found = dict(zip(keys, await asyncio.gather(*[search(*searches[key]) for key in keys])))
+    details = await fetch_video_details_async(_collect_video_ids(list(found.values()))) if enrich else {}
+    
+    results = []
+    for skills, plan in zip(extractions, plans):
+        if isinstance(skills, Exception):
+            results.append({'status': 'error', 'message': str(skills)})
+            continue
+        videos = [found[_search_dedupe_key(query, _candidate_count(max_results, enrich), is_technical)]
+                  for _, query, max_results, is_technical in plan]
+        if enrich:
+            videos = _rank_results(plan, videos, details)
+        results.append({'status': 'success', 'recommendations': _assemble_recommendations(plan, videos)})
+    
+    return results
 
-def generate_video_recommendations(report_text: str, max_videos_per_skill: int = None) -> Dict[str, List[tuple]]:
-    """Generate video recommendations based on the report with focus on technical content.
+def _skill_event(label: str, videos: List[tuple]) -> Dict[str, Any]:
+    return {
+        'event': 'skill',
+        'skill': label,
+        'videos': [{'title': title, 'url': url} for title, url in videos]
+    }
+
+def iter_video_recommendations(report_text: str, max_videos_per_skill: int = None,
+                               max_workers: int = None, enrich: bool = None,
+                               deadline_ms: int = None) -> Iterator[Dict[str, Any]]:
+    """Generate video recommendations as a stream of events.
+    
+    Yields a 'skills' event with every skill that will be searched, then one
+    'skill' event per skill as soon as its search completes (in completion
+    order, with an empty video list if nothing was found), and finally a
+    'done' event with totals. If the deadline cuts the stream short, the
+    'done' event has partial set and lists the unresolved skills in pending.
     
     Args:
         report_text: The interview analysis report text
         max_videos_per_skill: Maximum number of videos to return per skill. 
                             If None, uses DEFAULT_VIDEO_COUNT
-                            
-    Returns:
-        Dictionary mapping skills to list of (video_title, video_url) tuples
+        max_workers: Number of per-skill searches to run concurrently.
+                     If None, uses SEARCH_CONCURRENCY
+        enrich: Rank a larger set of candidates by duration, views, likes and age,
+                looking up details per skill as it resolves. If None, uses ENRICH_RESULTS
+        deadline_ms: Time budget in milliseconds for the whole stream.
+                     If None, calls are only bounded by their own timeouts
+                     
+    Yields:
+        JSON-serializable event dictionaries
     """
     if not report_text or not report_text.strip():
         raise ValueError("Report text cannot be empty")
-        
-    # Extract skills from the report
-    skills = extract_weak_areas(report_text)
+    
+    deadline = _deadline_after(deadline_ms)
+    with _deadline_until(deadline):
+        try:
+            skills = extract_weak_areas(report_text)
+        except Exception:
+            if not _deadline_passed():
+                raise
+            skills = None
+    if skills is None:
+        yield {'event': 'done', 'skill_count': 0, 'video_count': 0, 'partial': True, 'pending': []}
+        return
     if not skills:
         print("No skills found in the report, using default technical skills")
         skills = ["Technical Interview Skills"]
     
-    # Separate technical and non-technical skills
-    technical_skills = []
-    soft_skills = []
+    plan = _build_search_plan(skills, max_videos_per_skill)
+    yield {'event': 'skills', 'skills': [label for label, _, _, _ in plan]}
     
-    technical_terms = ['programming', 'coding', 'algorithm', 'data structure', 
-                      'system design', 'technical', 'computer science', 'software']
+    enrich = ENRICH_RESULTS if enrich is None else enrich
+    video_count = 0
+    resolved = set()
+    cut_short = False
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers or SEARCH_CONCURRENCY, len(plan))))
+    try:
+        with _deadline_until(deadline):
+            futures = {}
+            for entry in plan:
+                _, query, max_results, is_technical = entry
+                futures[_submit(
+                    executor, search_youtube_videos, query,
+                    max_results=_candidate_count(max_results, enrich), is_technical=is_technical
+                )] = entry
+        try:
+            for future in as_completed(futures, timeout=None if deadline is None else max(0.0, deadline - time.monotonic())):
+                label, _, max_results, _ = futures[future]
+                if future.cancelled() or isinstance(future.exception(), DeadlineExceeded):
+                    continue
+                videos = future.result()
+                if enrich:
+                    with _deadline_until(deadline):
+                        details = fetch_video_details(_collect_video_ids([videos]))
+                    videos = rank_videos(videos, details, max_results)
+                resolved.add(label)
+                cut_short = cut_short or getattr(videos, 'cut_by_deadline', False)
+                video_count += len(videos)
+                yield _skill_event(label, videos)
+        except FuturesTimeoutError:
+            pass
+    finally:
+        # Do not wait for searches still running past the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
     
-    for skill in skills:
-        if not skill or not skill.strip():
-            continue
-            
-        skill_lower = skill.lower()
-        if any(term in skill_lower for term in technical_terms):
-            technical_skills.append(skill)
-        else:
-            soft_skills.append(skill)
+    pending = [label for label, _, _, _ in plan if label not in resolved]
+    yield {'event': 'done', 'skill_count': len(plan), 'video_count': video_count,
+           'partial': bool(pending) or cut_short, 'pending': pending}
+
+async def aiter_video_recommendations(report_text: str, max_videos_per_skill: int = None,
+                                      max_workers: int = None, enrich: bool = None,
+                                      deadline_ms: int = None) -> AsyncIterator[Dict[str, Any]]:
+    """Async version of iter_video_recommendations for use inside an event loop."""
+    if not report_text or not report_text.strip():
+        raise ValueError("Report text cannot be empty")
     
-    # If no technical skills found, add a default one
-    if not technical_skills:
-        technical_skills = ["Technical Interview Skills"]
+    deadline = _deadline_after(deadline_ms)
+    with _deadline_until(deadline):
+        try:
+            skills = await extract_weak_areas_async(report_text)
+        except Exception:
+            if not _deadline_passed():
+                raise
+            skills = None
+    if skills is None:
+        yield {'event': 'done', 'skill_count': 0, 'video_count': 0, 'partial': True, 'pending': []}
+        return
+    if not skills:
+        print("No skills found in the report, using default technical skills")
+        skills = ["Technical Interview Skills"]
     
-    # Process technical skills first
-    recommendations = {}
+    plan = _build_search_plan(skills, max_videos_per_skill)
+    yield {'event': 'skills', 'skills': [label for label, _, _, _ in plan]}
     
-    # Get technical interview videos first
-    for skill in technical_skills:
-        query = f"{skill} interview preparation"
-        results = search_youtube_videos(
-            query, 
-            max_results=max_videos_per_skill,
-            is_technical=True
-        )
-        if results:
-            recommendations[f"{skill} (Technical)"] = results
-    
-    # Then get soft skills videos if we have space
-    max_soft_skills = min(3, len(soft_skills))  # Limit to top 3 soft skills
-    for skill in soft_skills[:max_soft_skills]:
-        query = f"{skill} for technical interviews"
-        results = search_youtube_videos(
-            query, 
-            max_results=max(1, (max_videos_per_skill or DEFAULT_VIDEO_COUNT) // 2)
-        )
-        if results:
-            recommendations[skill] = results
+    enrich = ENRICH_RESULTS if enrich is None else enrich
+    semaphore = asyncio.Semaphore(max(1, max_workers or SEARCH_CONCURRENCY))
     
-    return recommendations
+    async def run(label: str, query: str, max_results: int, is_technical: bool) -> Tuple[str, List[tuple]]:
+        async with semaphore:
+            videos = await search_youtube_videos_async(
+                query, max_results=_candidate_count(max_results, enrich), is_technical=is_technical
+            )
+        if enrich:
+            videos = rank_videos(videos, await fetch_video_details_async(_collect_video_ids([videos])), max_results)
+        return label, videos
+    
+    video_count = 0
+    resolved = set()
+    cut_short = False
+    # Tasks copy the context they are created in, so their upstream calls see the deadline
+    with _deadline_until(deadline):
+        tasks = [asyncio.ensure_future(run(*entry)) for entry in plan]
+    try:
+        for next_result in asyncio.as_completed(
+                tasks, timeout=None if deadline is None else max(0.0, deadline - time.monotonic())):
+            try:
+                label, videos = await next_result
+            except DeadlineExceeded:
+                continue
+            resolved.add(label)
+            cut_short = cut_short or getattr(videos, 'cut_by_deadline', False)
+            video_count += len(videos)
+            yield _skill_event(label, videos)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    pending = [label for label, _, _, _ in plan if label not in resolved]
+    yield {'event': 'done', 'skill_count': len(plan), 'video_count': video_count,
+           'partial': bool(pending) or cut_short, 'pending': pending}
+
+def format_stream_event(event: Dict[str, Any], stream_format: str = 'ndjson') -> str:
+    """Serialize a recommendation event as an NDJSON line or a Server-Sent Event."""
+    payload = json.dumps(event)
+    if stream_format == 'sse':
+        return f"event: {event['event']}\ndata: {payload}\n\n"
+    return payload + '\n'
 
 def display_recommendations(recommendations: Dict[str, List[tuple]]) -> None:
     """Display the video recommendations in a user-friendly format.
@@ -323,6 +2442,115 @@ def get_report_from_stdin() -> str:
     return report_text
 
 
+def discover_report_files(source: str, pattern: str = '*.txt') -> List[str]:
+    """Find report files in a directory (matching pattern) or from a glob expression.
+    
+    Args:
+        source: Directory to scan, or a glob such as 'reports/**/*.txt'
+        pattern: Filename pattern used when source is a directory
+        
+    Returns:
+        Sorted list of file paths
+    """
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, '**', pattern), recursive=True)
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+def _load_checkpoint(output_path: str) -> set:
+    """Return the report files already processed successfully according to a JSONL results file."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if record['status'] == 'success':
+                    done.add(record['file'])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                # A line cut short by an interrupted run is simply reprocessed
+                continue
+    return done
+
+def run_batch(paths: List[str], output_path: str, max_videos_per_skill: int = None,
+              max_workers: int = None, batch_size: int = 100, enrich: bool = None) -> Dict[str, int]:
+    """Generate recommendations for many report files, appending results to a JSONL file.
+    
+    Files are processed in chunks through generate_batch_recommendations so
+    shared skills are searched once per chunk (and across chunks through the
+    search cache). Each chunk is written and flushed as soon as it finishes, and
+    files already present in output_path are skipped, so an interrupted run
+    resumes where it stopped. Failed reports are retried on the next run and
+    appended again, so a file can have several records; the last one is current.
+    
+    Args:
+        paths: Report file paths
+        output_path: JSONL file to append results to; also serves as the checkpoint
+        max_videos_per_skill: Maximum number of videos per skill. If None, uses DEFAULT_VIDEO_COUNT
+        max_workers: Number of extractions and searches to run concurrently
+        batch_size: Number of reports per chunk
+        enrich: Rank candidates by video details. If None, uses ENRICH_RESULTS
+        
+    Returns:
+        Dictionary with 'processed', 'skipped' and 'failed' counts
+    """
+    done = _load_checkpoint(output_path)
+    todo = [path for path in paths if path not in done]
+    counts = {'processed': 0, 'skipped': len(paths) - len(todo), 'failed': 0}
+    
+    if counts['skipped']:
+        print(f"Resuming: {counts['skipped']} report(s) already in {output_path}")
+    
+    with open(output_path, 'a', encoding='utf-8') as out:
+        for start in range(0, len(todo), max(1, batch_size)):
+            chunk = todo[start:start + max(1, batch_size)]
+            
+            reports = {}
+            results = {}
+            for path in chunk:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        reports[path] = f.read()
+                except Exception as e:
+                    print(f"Error reading report file {path}: {e}")
+                    results[path] = {'status': 'error', 'message': f"Failed to read report file: {e}"}
+            
+            readable = [path for path in chunk if path in reports]
+            if readable:
+                results.update(zip(readable, generate_batch_recommendations(
+                    [reports[path] for path in readable],
+                    max_videos_per_skill=max_videos_per_skill,
+                    max_workers=max_workers,
+                    enrich=enrich
+                )))
+            
+            for path in chunk:
+                result = results[path]
+                record = {'file': path, 'status': result['status']}
+                if result['status'] == 'success':
+                    record['recommendations'] = [
+                        {
+                            'skill': skill,
+                            'videos': [{'title': title, 'url': url} for title, url in videos]
+                        }
+                        for skill, videos in result['recommendations'].items()
+                    ]
+                    counts['processed'] += 1
+                else:
+                    record['message'] = result['message']
+                    counts['failed'] += 1
+                out.write(json.dumps(record) + '\n')
+            
+            out.flush()
+            os.fsync(out.fileno())
+            print(f"Processed {start + len(chunk)}/{len(todo)} report(s)")
+    
+    return counts
+
+
 def main():
     """Main entry point for the script."""
     import argparse
@@ -333,9 +2561,51 @@ def main():
                        help=f'Maximum number of videos per skill (default: {DEFAULT_VIDEO_COUNT})')
     parser.add_argument('--interactive', action='store_true',
                       help='Enable interactive mode to enter report text directly')
+    parser.add_argument('--workers', type=int, default=None,
+                       help=f'Number of concurrent YouTube searches (default: {SEARCH_CONCURRENCY})')
+    parser.add_argument('--batch', type=str, default=None,
+                       help='Directory or glob of report files to process offline')
+    parser.add_argument('--pattern', type=str, default='*.txt',
+                       help='Filename pattern used when --batch is a directory (default: *.txt)')
+    parser.add_argument('--output', type=str, default='batch_results.jsonl',
+                       help='JSONL file that --batch appends results to and resumes from (default: batch_results.jsonl)')
+    parser.add_argument('--batch-size', type=int, default=100,
+                       help='Number of reports processed together in --batch mode (default: 100)')
+    parser.add_argument('--build-skill-table', action='store_true',
+                       help='Search every skill in SKILL_TABLE_SKILLS and save the table to SKILL_TABLE_PATH')
+    parser.add_argument('--enrich', action='store_true', default=None,
+                       help='Rank more candidates by duration, views, likes and age (default: ENRICH_RESULTS)')
     
     args = parser.parse_args()
     
+    if args.build_skill_table:
+        from skill_table import SkillTable
+        
+        table = SkillTable(_resolve_table_entry, path=SKILL_TABLE_PATH, max_entries=SKILL_TABLE_SIZE,
+                           refresh_interval=0)
+        table.load()
+        built = table.build(_skill_table_keys(SKILL_TABLE_SKILLS))
+        print(f"Built {built}/{len(SKILL_TABLE_SKILLS)} skill(s) into {SKILL_TABLE_PATH}")
+        return
+    
+    if args.batch:
+        paths = discover_report_files(args.batch, args.pattern)
+        if not paths:
+            print(f"No report files found for: {args.batch}")
+            return
+        
+        counts = run_batch(
+            paths,
+            args.output,
+            max_videos_per_skill=args.max_videos,
+            max_workers=args.workers,
+            batch_size=args.batch_size,
+            enrich=args.enrich
+        )
+        print(f"Done: {counts['processed']} processed, {counts['failed']} failed, "
+              f"{counts['skipped']} skipped. Results in {args.output}")
+        return
+    
     try:
         # Get report text from file, stdin, or use default skills
         if args.report:
@@ -354,7 +2624,9 @@ def main():
         # Generate and display recommendations
         recommendations = generate_video_recommendations(
             report_text, 
-            max_videos_per_skill=args.max_videos
+            max_videos_per_skill=args.max_videos,
+            max_workers=args.workers,
+            enrich=args.enrich
         )
         
         display_recommendations(recommendations)
@@ -364,87 +2636,201 @@ def main():
         print("\nPlease check the report text and try again.")
 
 
-# Initialize Flask app
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
-# Configure CORS to allow requests from Mockmingle.in
-# CORS(app, resources={
-#     r"/api/*": {
-#         "origins": [
-#             "https://mockmingle.in",
-#             "http://mockmingle.in",
-#             "https://www.mockmingle.in",
-#             "http://localhost:3000",  # For local development
-#             "https://localhost:3000"
-
-#         ],
-#         "methods": ["GET", "POST", "OPTIONS"],
-#         "allow_headers": ["Content-Type"],
-#         "supports_credentials": True
-#     }
-# })
-
-# Add a simple route for testing
-@app.route('/')
-def home():
-    return "YouTube Video Recommendations API is running!"
-
-@app.route('/api/recommendations', methods=['POST'])
-def get_recommendations():
-    """API endpoint to get video recommendations for a given report."""
-    try:
-        # Get JSON data from request
-        data = request.get_json()
-        
+def create_app():
+    """Create the Flask app serving the recommendations API."""
+    from flask import Flask, Response, request, jsonify
+    from flask_cors import CORS
+    
+    app = Flask(__name__)
+    CORS(app)  # Enable CORS for all routes
+    # Configure CORS to allow requests from Mockmingle.in
+    # CORS(app, resources={
+    #     r"/api/*": {
+    #         "origins": [
+    #             "https://mockmingle.in",
+    #             "http://mockmingle.in",
+    #             "https://www.mockmingle.in",
+    #             "http://localhost:3000",  # For local development
+    #             "https://localhost:3000"
+
+    #         ],
+    #         "methods": ["GET", "POST", "OPTIONS"],
+    #         "allow_headers": ["Content-Type"],
+    #         "supports_credentials": True
+    #     }
+    # })
+
+    # Add a simple route for testing
+    @app.route('/')
+    def home():
+        return "YouTube Video Recommendations API is running!"
+
+    @app.route('/api/recommendations', methods=['POST'])
+    def get_recommendations():
+        """API endpoint to get video recommendations for a given report."""
+        try:
+            # Get JSON data from request
+            data = request.get_json()
+
+            if not data or 'report' not in data:
+                return jsonify({
+                    'error': 'Missing required field: report',
+                    'status': 'error'
+                }), 400
+
+            # Get max_videos parameter if provided
+            max_videos = data.get('max_videos')
+
+            # Generate recommendations within the request deadline
+            recommendations = generate_video_recommendations(
+                data['report'],
+                max_videos_per_skill=max_videos,
+                enrich=data.get('enrich'),
+                deadline_ms=request_deadline_ms(request.headers.get('X-Request-Deadline-Ms'), data.get('deadline_ms'))
+            )
+
+            # Format the response
+            response = {
+                'status': 'success',
+                'recommendations': [
+                    {
+                        'skill': skill,
+                        'videos': [{'title': title, 'url': url} for title, url in videos]
+                    }
+                    for skill, videos in recommendations.items()
+                ],
+                'partial': recommendations.partial,
+                'pending': recommendations.pending
+            }
+
+            return jsonify(response)
+
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 500
+
+    @app.route('/api/recommendations/stream', methods=['POST'])
+    def stream_recommendations():
+        """API endpoint that streams video recommendations as each skill resolves.
+
+        Responds with Server-Sent Events if the client accepts text/event-stream,
+        otherwise with newline-delimited JSON.
+        """
+        data = request.get_json(silent=True)
+
         if not data or 'report' not in data:
             return jsonify({
                 'error': 'Missing required field: report',
                 'status': 'error'
             }), 400
-        
-        # Get max_videos parameter if provided
+
+        stream_format = 'sse' if 'text/event-stream' in request.headers.get('Accept', '') else 'ndjson'
+        report_text = data['report']
         max_videos = data.get('max_videos')
-        
-        # Generate recommendations
-        recommendations = generate_video_recommendations(
-            data['report'],
-            max_videos_per_skill=max_videos
-        )
-        
-        # Format the response
-        response = {
-            'status': 'success',
-            'recommendations': [
-                {
-                    'skill': skill,
-                    'videos': [{'title': title, 'url': url} for title, url in videos]
-                }
-                for skill, videos in recommendations.items()
-            ]
-        }
-        
-        return jsonify(response)
-        
-    except Exception as e:
+        enrich = data.get('enrich')
+        deadline_ms = request_deadline_ms(request.headers.get('X-Request-Deadline-Ms'), data.get('deadline_ms'))
+
+        def generate():
+            try:
+                for event in iter_video_recommendations(report_text, max_videos_per_skill=max_videos, enrich=enrich,
+                                                        deadline_ms=deadline_ms):
+                    yield format_stream_event(event, stream_format)
+            except Exception as e:
+                yield format_stream_event({'event': 'error', 'message': str(e)}, stream_format)
+
+        mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+        return Response(generate(), mimetype=mimetype, headers={'Cache-Control': 'no-cache'})
+
+    @app.route('/api/recommendations/batch', methods=['POST'])
+    def get_batch_recommendations():
+        """API endpoint to get video recommendations for many reports in one call."""
+        try:
+            data = request.get_json()
+
+            if not data or not isinstance(data.get('reports'), list):
+                return jsonify({
+                    'error': 'Missing required field: reports',
+                    'status': 'error'
+                }), 400
+
+            if len(data['reports']) > MAX_BATCH_REPORTS:
+                return jsonify({
+                    'error': f'Too many reports: at most {MAX_BATCH_REPORTS} per batch',
+                    'status': 'error'
+                }), 400
+
+            results = generate_batch_recommendations(
+                data['reports'],
+                max_videos_per_skill=data.get('max_videos'),
+                enrich=data.get('enrich')
+            )
+
+            # Format the response
+            response = {'status': 'success', 'results': []}
+            for index, result in enumerate(results):
+                if result['status'] != 'success':
+                    response['results'].append(dict(result, index=index))
+                    continue
+                response['results'].append({
+                    'index': index,
+                    'status': 'success',
+                    'recommendations': [
+                        {
+                            'skill': skill,
+                            'videos': [{'title': title, 'url': url} for title, url in videos]
+                        }
+                        for skill, videos in result['recommendations'].items()
+                    ]
+                })
+
+            return jsonify(response)
+
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 500
+
+    # Health check endpoint
+    @app.route('/health', methods=['GET'])
+    def health_check():
+        """Health check endpoint."""
+        semantic_cache = get_semantic_cache()
         return jsonify({
-            'status': 'error',
-            'message': str(e)
-        }), 500
-
-# Health check endpoint
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'youtube-recommendations',
-        'version': '1.0.0'
-    }), 200
+            'status': 'healthy',
+            'service': 'youtube-recommendations',
+            'version': '1.0.0',
+            'startup': STARTUP_METRICS,
+            'semantic_cache': semantic_cache.metrics() if semantic_cache is not None else None
+        }), 200
+
+    # Quota metrics endpoint
+    @app.route('/api/quota', methods=['GET'])
+    def quota_status():
+        """Report YouTube quota spend, remaining budget and the current degradation level."""
+        return jsonify(quota_scheduler.metrics()), 200
+    
+    return app
+
+_app = None
+
+def __getattr__(name: str):
+    """Create the Flask app on first access of main.app (e.g. `gunicorn main:app`)."""
+    global _app
+    if name == 'app':
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def run_web_server(host='0.0.0.0', port=5000, debug=False):
     """Run the Flask web server."""
     port = int(os.environ.get('PORT', port))
-    app.run(host=host, port=port, debug=debug)
+    create_app().run(host=host, port=port, debug=debug)
+
+STARTUP_METRICS['module_import_ms'] = round((time.perf_counter() - _import_started) * 1000, 1)
 
 if __name__ == "__main__":
     # If no command line arguments, run the web server
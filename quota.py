@@ -0,0 +1,226 @@
+import time
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:
+    # YouTube quotas reset at midnight Pacific Time; fall back to PST without tz data
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+# Quota units charged per call by the YouTube Data API v3
+QUOTA_COSTS = {
+    'search.list': 100,
+    'videos.list': 1,
+}
+
+# Degradation levels, from normal operation to serving only cached results
+LEVEL_NORMAL = 0
+LEVEL_FEWER_SOFT_SKILLS = 1
+LEVEL_REDUCED_RESULTS = 2
+LEVEL_CACHE_ONLY = 3
+LEVEL_NAMES = {
+    LEVEL_NORMAL: 'normal',
+    LEVEL_FEWER_SOFT_SKILLS: 'fewer_soft_skills',
+    LEVEL_REDUCED_RESULTS: 'reduced_results',
+    LEVEL_CACHE_ONLY: 'cache_only',
+}
+
+
+def _hour_bucket(now: Optional[datetime] = None) -> str:
+    now = now or datetime.now(QUOTA_TIMEZONE)
+    return now.strftime('%Y-%m-%dT%H')
+
+
+class QuotaLedger:
+    """Count YouTube Data API quota units spent per quota day.
+
+    Usage is recorded per hour and API method. With a path, counts live in a
+    SQLite database so every worker on the host charges the same ledger and
+    counts survive restarts; without one they are kept in this process.
+
+    Args:
+        daily_quota: Units available per day for the project
+        path: Optional SQLite database file shared across processes
+    """
+
+    def __init__(self, daily_quota: int = 10000, path: Optional[str] = None):
+        self.daily_quota = daily_quota
+        self.path = path
+        self._lock = threading.Lock()
+        self._usage = {}
+        self._local = threading.local()
+
+        if path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS quota_usage ("
+                        " hour TEXT NOT NULL,"
+                        " method TEXT NOT NULL,"
+                        " units INTEGER NOT NULL,"
+                        " calls INTEGER NOT NULL,"
+                        " PRIMARY KEY (hour, method))"
+                    )
+            except sqlite3.Error as e:
+                print(f"Warning: Failed to open quota ledger {path}, counting in memory: {e}")
+                self.path = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def charge(self, method: str, calls: int = 1, units: Optional[int] = None) -> int:
+        """Record calls to an API method and return the units charged."""
+        units = QUOTA_COSTS.get(method, 1) * calls if units is None else units
+        hour = _hour_bucket()
+
+        if not self.path:
+            with self._lock:
+                spent_units, spent_calls = self._usage.get((hour, method), (0, 0))
+                self._usage[(hour, method)] = (spent_units + units, spent_calls + calls)
+            return units
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO quota_usage (hour, method, units, calls) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (hour, method) DO UPDATE SET"
+                    " units = units + excluded.units, calls = calls + excluded.calls",
+                    (hour, method, units, calls)
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: Failed to record quota usage: {e}")
+        return units
+
+    async def charge_async(self, method: str, calls: int = 1, units: Optional[int] = None) -> int:
+        """Async version of charge; a SQLite ledger is written off the event loop."""
+        if not self.path:
+            return self.charge(method, calls, units)
+        return await asyncio.to_thread(self.charge, method, calls, units)
+
+    def exhaust(self) -> None:
+        """Record the rest of today's quota as spent, e.g. after a quotaExceeded error."""
+        remaining = self.remaining()
+        if remaining > 0:
+            self.charge('quotaExceeded', calls=0, units=remaining)
+
+    async def exhaust_async(self) -> None:
+        """Async version of exhaust."""
+        if not self.path:
+            self.exhaust()
+        else:
+            await asyncio.to_thread(self.exhaust)
+
+    def _usage_since(self, since: str) -> Dict[str, Dict[str, int]]:
+        """Return {hour: {method: units}} for hour buckets at or after since."""
+        usage = {}
+        if not self.path:
+            with self._lock:
+                items = list(self._usage.items())
+            for (hour, method), (units, _) in items:
+                if hour >= since:
+                    usage.setdefault(hour, {})[method] = units
+            return usage
+
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT hour, method, units FROM quota_usage WHERE hour >= ?", (since,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Warning: Failed to read quota usage: {e}")
+            return usage
+        for hour, method, units in rows:
+            usage.setdefault(hour, {})[method] = units
+        return usage
+
+    def spent_today(self) -> int:
+        today = datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%dT00')
+        return sum(sum(methods.values()) for methods in self._usage_since(today).values())
+
+    def remaining(self) -> int:
+        return max(0, self.daily_quota - self.spent_today())
+
+    def metrics(self) -> Dict[str, object]:
+        """Return today's spend, remaining budget and per-hour usage for the last 24 hours."""
+        now = datetime.now(QUOTA_TIMEZONE)
+        usage = self._usage_since(_hour_bucket(now - timedelta(hours=23)))
+        today = now.strftime('%Y-%m-%d')
+        spent = sum(sum(methods.values()) for hour, methods in usage.items() if hour.startswith(today))
+        return {
+            'daily_quota': self.daily_quota,
+            'spent_today': spent,
+            'remaining': max(0, self.daily_quota - spent),
+            'units_this_hour': sum(usage.get(_hour_bucket(now), {}).values()),
+            'hourly_units': {hour: sum(methods.values()) for hour, methods in sorted(usage.items())},
+        }
+
+
+class QuotaScheduler:
+    """Pick how far to degrade YouTube usage based on the remaining daily budget.
+
+    As the remaining fraction of the quota drops below each threshold, the
+    pipeline first searches fewer soft skills, then asks for fewer videos per
+    skill, and finally serves only cached results.
+
+    Args:
+        ledger: Ledger that tracks spent units
+        fewer_soft_skills_at: Remaining fraction at or below which soft-skill searches are cut
+        reduced_results_at: Remaining fraction at or below which videos per skill are cut
+        cache_only_at: Remaining fraction at or below which no new searches are made
+        refresh_interval: Seconds to reuse the computed level before reading the ledger again
+    """
+
+    def __init__(self, ledger: QuotaLedger, fewer_soft_skills_at: float = 0.3,
+                 reduced_results_at: float = 0.15, cache_only_at: float = 0.05,
+                 refresh_interval: float = 5.0):
+        self.ledger = ledger
+        self.fewer_soft_skills_at = fewer_soft_skills_at
+        self.reduced_results_at = reduced_results_at
+        self.cache_only_at = cache_only_at
+        self.refresh_interval = refresh_interval
+        self._level = LEVEL_NORMAL
+        self._checked_at = None
+
+    def level(self) -> int:
+        """Return the current degradation level (one of the LEVEL_* constants)."""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_interval:
+            return self._level
+
+        if self.ledger.daily_quota <= 0:
+            remaining_fraction = 1.0
+        else:
+            remaining_fraction = self.ledger.remaining() / self.ledger.daily_quota
+
+        if remaining_fraction <= self.cache_only_at:
+            level = LEVEL_CACHE_ONLY
+        elif remaining_fraction <= self.reduced_results_at:
+            level = LEVEL_REDUCED_RESULTS
+        elif remaining_fraction <= self.fewer_soft_skills_at:
+            level = LEVEL_FEWER_SOFT_SKILLS
+        else:
+            level = LEVEL_NORMAL
+
+        self._level = level
+        self._checked_at = now
+        return level
+
+    async def level_async(self) -> int:
+        """Async version of level; a stale level is recomputed from a SQLite ledger off the event loop."""
+        fresh = self._checked_at is not None and time.monotonic() - self._checked_at < self.refresh_interval
+        if fresh or not self.ledger.path:
+            return self.level()
+        return await asyncio.to_thread(self.level)
+
+    def metrics(self) -> Dict[str, object]:
+        return dict(self.ledger.metrics(), degradation_level=LEVEL_NAMES[self.level()])
@@ -0,0 +1,153 @@
+import time
+import asyncio
+import sqlite3
+import threading
+from typing import Optional
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a caller would have to wait longer than its timeout for capacity."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket that makes callers queue for capacity.
+
+    Each acquire reserves its tokens immediately, letting the balance go
+    negative, and then sleeps until the bucket has refilled. Reservations are
+    therefore served in arrival order, and a caller whose wait would exceed its
+    timeout gets its tokens back and RateLimitExceeded instead.
+
+    Args:
+        rate: Tokens added per second. A value of 0 or less disables the limiter
+        capacity: Maximum burst size. If None, one second's worth of tokens (at least 1)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _reserve(self, tokens: float, timeout: Optional[float]) -> float:
+        """Reserve tokens and return the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                raise RateLimitExceeded(f"Rate limit wait of {wait:.1f}s exceeds {timeout:.1f}s")
+            self._tokens -= tokens
+            return wait
+
+    async def _reserve_async(self, tokens: float, timeout: Optional[float]) -> float:
+        """Async version of _reserve; the in-memory reservation never blocks, so it runs inline."""
+        return self._reserve(tokens, timeout)
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> None:
+        """Block until tokens are available, or raise RateLimitExceeded after timeout seconds."""
+        if not self.enabled:
+            return
+        wait = self._reserve(min(tokens, self.capacity), timeout)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1, timeout: Optional[float] = None) -> None:
+        """Async version of acquire that sleeps without blocking the event loop."""
+        if not self.enabled:
+            return
+        wait = await self._reserve_async(min(tokens, self.capacity), timeout)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """Token bucket whose balance lives in SQLite, shared by every process on the host.
+
+    Args:
+        path: Path to the SQLite database file
+        name: Name of the bucket, so several limiters can share one file
+        rate: Tokens added per second. A value of 0 or less disables the limiter
+        capacity: Maximum burst size. If None, one second's worth of tokens (at least 1)
+    """
+
+    def __init__(self, path: str, name: str, rate: float, capacity: Optional[float] = None):
+        super().__init__(rate, capacity)
+        self.path = path
+        self.name = name
+        self._local = threading.local()
+
+        if self.enabled:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS rate_limits ("
+                    " name TEXT PRIMARY KEY,"
+                    " tokens REAL NOT NULL,"
+                    " updated_at REAL NOT NULL)"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode so _reserve can open its own IMMEDIATE transaction
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _reserve(self, tokens: float, timeout: Optional[float]) -> float:
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front so concurrent workers serialize here
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            print(f"Warning: Shared rate limiter unavailable, using local limit: {e}")
+            return super()._reserve(tokens, timeout)
+
+        try:
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated_at FROM rate_limits WHERE name = ?", (self.name,)).fetchone()
+            balance = self.capacity if row is None else min(self.capacity, row[0] + (now - row[1]) * self.rate)
+
+            wait = max(0.0, (tokens - balance) / self.rate)
+            if timeout is not None and wait > timeout:
+                raise RateLimitExceeded(f"Rate limit wait of {wait:.1f}s exceeds {timeout:.1f}s")
+
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (self.name, balance - tokens, now)
+            )
+            conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def _reserve_async(self, tokens: float, timeout: Optional[float]) -> float:
+        # Waiting on another worker's write lock would otherwise stall the whole event loop
+        return await asyncio.to_thread(self._reserve, tokens, timeout)
+
+
+def create_rate_limiter(name: str, rate: float, capacity: Optional[float] = None,
+                        backend: str = 'memory', path: Optional[str] = None) -> TokenBucket:
+    """Create a token bucket for the configured backend.
+
+    Args:
+        name: Name of the limiter, used to separate buckets in shared backends
+        rate: Tokens added per second. A value of 0 or less disables the limiter
+        capacity: Maximum burst size
+        backend: 'memory' for a per-process limiter or 'sqlite' for one shared across processes
+        path: Database path for the 'sqlite' backend
+
+    Returns:
+        A TokenBucket or SQLiteTokenBucket instance
+    """
+    if (backend or 'memory').lower() == 'sqlite':
+        return SQLiteTokenBucket(path or 'cache.sqlite3', name, rate, capacity)
+    return TokenBucket(rate, capacity)
@@ -0,0 +1,135 @@
+import re
+import zlib
+import bisect
+import threading
+from typing import Any, Dict, List, Optional
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+# Upper bounds of the similarity histogram buckets reported by metrics()
+SIMILARITY_BUCKETS = (0.5, 0.7, 0.8, 0.9, 0.95, 0.98)
+
+
+class SemanticReportCache:
+    """In-memory cache that reuses extracted weak areas for near-duplicate reports.
+
+    Reports are turned into hashed TF-IDF vectors: word unigrams and bigrams
+    are hashed into a fixed number of signed buckets, so no vocabulary is kept,
+    with sublinear term frequencies and IDF weights from the reports stored so
+    far. A lookup compares the report with every stored one using two NumPy
+    matrix-vector products and returns the value of the most similar report if their
+    cosine similarity reaches threshold. Once max_entries reports are stored,
+    the oldest is replaced.
+
+    Args:
+        max_entries: Maximum number of reports kept
+        dimensions: Number of hash buckets per vector
+        threshold: Minimum cosine similarity for a hit
+    """
+
+    def __init__(self, max_entries: int = 2000, dimensions: int = 2048, threshold: float = 0.95):
+        import numpy as np
+
+        self._np = np
+        self.max_entries = max_entries
+        self.dimensions = dimensions
+        self.threshold = threshold
+        self._vectors = np.zeros((max_entries, dimensions), dtype=np.float32)
+        # Squared entries let row norms under any IDF weighting be computed with one matrix-vector product
+        self._squares = np.zeros((max_entries, dimensions), dtype=np.float32)
+        self._doc_freq = np.zeros(dimensions, dtype=np.int32)
+        self._values = [None] * max_entries
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._similarity_sum = 0.0
+        self._histogram = [0] * (len(SIMILARITY_BUCKETS) + 1)
+
+    def _term_frequencies(self, text: str):
+        """Hash a report's unigrams and bigrams into a signed, sublinearly scaled count vector."""
+        np = self._np
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+        if not features:
+            return np.zeros(self.dimensions, dtype=np.float32)
+
+        hashes = np.fromiter((zlib.crc32(feature.encode('utf-8')) for feature in features),
+                             dtype=np.uint32, count=len(features))
+        # The top hash bit picks the sign so colliding features tend to cancel out
+        signs = np.where(hashes >> 31, -1.0, 1.0)
+        counts = np.bincount(hashes % self.dimensions, weights=signs, minlength=self.dimensions)
+        return (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+
+    def _record(self, similarity: Optional[float], hit: bool) -> None:
+        if hit:
+            self._hits += 1
+        else:
+            self._misses += 1
+        if similarity is not None:
+            self._similarity_sum += similarity
+            self._histogram[bisect.bisect_right(SIMILARITY_BUCKETS, similarity)] += 1
+
+    def get(self, text: str) -> Optional[List[Any]]:
+        """Return the value stored for the most similar report, or None if none is similar enough."""
+        np = self._np
+        query = self._term_frequencies(text)
+
+        with self._lock:
+            if self._size == 0 or not query.any():
+                self._record(None, hit=False)
+                return None
+
+            idf = np.log((1 + self._size) / (1 + self._doc_freq)).astype(np.float32) + 1
+            # cos(X*idf, q*idf) = X @ (q * idf^2) / (sqrt(X^2 @ idf^2) * |q*idf|)
+            weights = idf * idf
+            dots = self._vectors[:self._size] @ (query * weights)
+            norms = np.sqrt(self._squares[:self._size] @ weights) * np.linalg.norm(query * idf)
+            similarities = dots / np.maximum(norms, 1e-12)
+
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            hit = similarity >= self.threshold
+            self._record(similarity, hit)
+            return list(self._values[best]) if hit else None
+
+    def set(self, text: str, value: List[Any]) -> None:
+        """Store the value extracted for a report, replacing the oldest report if full."""
+        vector = self._term_frequencies(text)
+        if not vector.any():
+            return
+
+        with self._lock:
+            slot = self._next
+            if self._size == self.max_entries:
+                self._doc_freq -= (self._vectors[slot] != 0)
+            else:
+                self._size += 1
+            self._vectors[slot] = vector
+            self._squares[slot] = vector * vector
+            self._doc_freq += (vector != 0)
+            self._values[slot] = list(value)
+            self._next = (slot + 1) % self.max_entries
+
+    def __len__(self) -> int:
+        return self._size
+
+    def metrics(self) -> Dict[str, object]:
+        """Return hit/miss counts and the distribution of best-match similarities."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            compared = sum(self._histogram)
+            # Signed hashing can make similarities slightly negative
+            bounds = (-1.0,) + SIMILARITY_BUCKETS + (1.0,)
+            return {
+                'entries': self._size,
+                'threshold': self.threshold,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'mean_similarity': round(self._similarity_sum / compared, 4) if compared else None,
+                'similarity_histogram': {
+                    f"{low:.2f}-{high:.2f}": count
+                    for low, high, count in zip(bounds, bounds[1:], self._histogram)
+                },
+            }
@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import queue
+import random
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+
+class SkillTable:
+    """Precomputed search results per skill, refreshed by a background thread.
+
+    Lookups are plain dictionary reads. Entries for configured skills are
+    pinned and built ahead of time; entries for other skills are added after a
+    live search through a background queue, expire after entry_ttl seconds, and
+    the least recently used of those are evicted beyond max_entries. Every
+    refresh_interval seconds the refresh thread re-resolves the pinned entries,
+    least recently resolved first and at most refresh_budget() of them, keeping
+    the old videos whenever a resolve fails or finds nothing. With a path, the
+    table is saved as JSON and a process that finds the file recently refreshed
+    by another process loads it instead of resolving again.
+
+    Args:
+        resolve: Function called with a key's parts that returns its videos, or None to keep the current ones
+        path: Optional JSON file the table is loaded from and saved to
+        max_entries: Maximum number of unpinned entries
+        refresh_interval: Seconds between background refreshes. A value of 0 or less disables refreshing
+        entry_ttl: Seconds an unpinned entry is served before it must be searched again. A value of 0 or less keeps them until evicted
+        refresh_budget: Optional function returning how many entries a refresh may resolve
+    """
+
+    def __init__(self, resolve: Callable[..., Optional[List[tuple]]], path: Optional[str] = None,
+                 max_entries: int = 1000, refresh_interval: float = 86400.0, entry_ttl: float = 86400.0,
+                 refresh_budget: Optional[Callable[[], int]] = None):
+        self.resolve = resolve
+        self.path = path
+        self.max_entries = max_entries
+        self.refresh_interval = refresh_interval
+        self.entry_ttl = entry_ttl
+        self.refresh_budget = refresh_budget
+        self._entries = OrderedDict()
+        self._stored_at = {}
+        self._pinned = set()
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+        self._hits = 0
+        self._misses = 0
+        self._refreshed_at = None
+
+    def get(self, key: Hashable) -> Optional[List[tuple]]:
+        """Return the stored videos for key, or None if it has none yet."""
+        with self._lock:
+            videos = self._entries.get(key)
+            if videos is not None and self._expired(key, time.time()):
+                self._discard(key)
+                videos = None
+            if videos is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return videos
+
+    def put(self, key: Hashable, videos: List[tuple], pinned: bool = False) -> None:
+        """Store videos for key, evicting the least recently used unpinned entries if full."""
+        with self._lock:
+            self._entries[key] = [tuple(video) for video in videos]
+            self._entries.move_to_end(key)
+            self._stored_at[key] = time.time()
+            if pinned:
+                self._pinned.add(key)
+
+            unpinned = len(self._entries) - len(self._pinned & self._entries.keys())
+            for old_key in list(self._entries):
+                if unpinned <= self.max_entries:
+                    break
+                if old_key not in self._pinned:
+                    self._discard(old_key)
+                    unpinned -= 1
+
+    def _expired(self, key: Hashable, now: float) -> bool:
+        return (key not in self._pinned and self.entry_ttl > 0
+                and now - self._stored_at.get(key, now) > self.entry_ttl)
+
+    def _discard(self, key: Hashable) -> None:
+        del self._entries[key]
+        self._stored_at.pop(key, None)
+
+    def submit(self, key: Hashable, videos: List[tuple]) -> None:
+        """Queue videos found by a live search for insertion off the request path."""
+        if videos:
+            self._pending.put((key, videos))
+            self.start()
+
+    def pin(self, keys: Iterable[Hashable]) -> None:
+        """Mark keys as configured skills that are refreshed and never evicted."""
+        with self._lock:
+            self._pinned.update(keys)
+
+    def build(self, keys: Iterable[Hashable]) -> int:
+        """Resolve and pin every key now, save the table, and return how many resolved."""
+        keys = list(keys)
+        self.pin(keys)
+        built = 0
+        for key in keys:
+            videos = self._resolve(key)
+            if videos:
+                self.put(key, videos, pinned=True)
+                built += 1
+        self._refreshed_at = time.time()
+        self.save()
+        return built
+
+    def refresh(self) -> None:
+        """Re-resolve the pinned entries, or adopt a fresher table saved by another process.
+
+        Unpinned entries are not searched again; they expire after entry_ttl and
+        are added back by the next request that misses them.
+        """
+        # Insertions save the file too, so only its refreshed_at says when, and whether another process, refreshed it
+        payload = self._read()
+        refreshed_at = payload.get('refreshed_at') if isinstance(payload, dict) else None
+        if (isinstance(refreshed_at, (int, float)) and refreshed_at > (self._refreshed_at or 0)
+                and time.time() - refreshed_at < self.refresh_interval / 2):
+            self._apply(payload)
+            return
+
+        with self._lock:
+            now = time.time()
+            for key in [key for key in self._entries if self._expired(key, now)]:
+                self._discard(key)
+            keys = sorted(self._pinned, key=lambda key: self._stored_at.get(key, 0))
+        if self.refresh_budget is not None:
+            budget = max(0, self.refresh_budget())
+            if budget < len(keys):
+                print(f"Warning: Quota budget allows refreshing {budget} of {len(keys)} skill table entries")
+                keys = keys[:budget]
+        for key in keys:
+            videos = self._resolve(key)
+            if videos:
+                with self._lock:
+                    self._entries[key] = [tuple(video) for video in videos]
+                    self._stored_at[key] = time.time()
+        self._refreshed_at = time.time()
+        self.save()
+
+    def _resolve(self, key: Hashable) -> Optional[List[tuple]]:
+        try:
+            return self.resolve(*key)
+        except Exception as e:
+            print(f"Warning: Failed to refresh skill table entry {key}: {e}")
+            return None
+
+    def _read(self) -> Optional[Dict[str, object]]:
+        """Return the saved table, or None if there is none to read."""
+        if not self.path:
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Failed to load skill table {self.path}: {e}")
+            return None
+
+    def load(self) -> bool:
+        """Replace the table with the saved one, returning False if there is none to load."""
+        payload = self._read()
+        return payload is not None and self._apply(payload)
+
+    def _apply(self, payload: Dict[str, object]) -> bool:
+        try:
+            entries = [(tuple(entry['key']), entry['videos'], entry.get('pinned', False), entry.get('stored_at'))
+                       for entry in payload['entries']]
+        except (KeyError, TypeError, AttributeError) as e:
+            print(f"Warning: Failed to load skill table {self.path}: {e}")
+            return False
+
+        # Tables saved before entries carried stored_at count from the last refresh
+        default_stored_at = payload.get('refreshed_at') or time.time()
+        with self._lock:
+            self._entries.clear()
+            self._stored_at.clear()
+            for key, videos, pinned, stored_at in entries:
+                self._entries[key] = [tuple(video) for video in videos]
+                self._stored_at[key] = stored_at if isinstance(stored_at, (int, float)) else default_stored_at
+                if pinned:
+                    self._pinned.add(key)
+        self._refreshed_at = payload.get('refreshed_at')
+        return True
+
+    def save(self) -> None:
+        """Write the table to path, replacing it atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            entries = [
+                {'key': list(key), 'videos': videos, 'pinned': key in self._pinned,
+                 'stored_at': self._stored_at.get(key)}
+                for key, videos in self._entries.items()
+            ]
+        temp_path = f"{self.path}.tmp.{os.getpid()}"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'refreshed_at': self._refreshed_at, 'entries': entries}, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Failed to save skill table {self.path}: {e}")
+
+    def start(self) -> None:
+        """Start the insertion thread and, if enabled, the refresh thread."""
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            self._threads.append(threading.Thread(target=self._insert_loop, name='skill-table-insert', daemon=True))
+            if self.refresh_interval > 0:
+                self._threads.append(threading.Thread(target=self._refresh_loop, name='skill-table-refresh', daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._pending.put(None)
+
+    def _insert_loop(self) -> None:
+        while not self._stop.is_set():
+            item = self._pending.get()
+            if item is None:
+                break
+            self.put(*item)
+            # Save once the current burst of insertions has drained
+            if self._pending.empty():
+                self.save()
+
+    def _refresh_loop(self) -> None:
+        # Jitter keeps workers started together from refreshing at the same moment
+        while not self._stop.wait(self.refresh_interval * random.uniform(0.9, 1.1)):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Warning: Skill table refresh failed: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'pinned': len(self._pinned),
+                'hits': self._hits,
+                'misses': self._misses,
+                'refreshed_at': self._refreshed_at,
+            }
@@ -0,0 +1,146 @@
+import re
+import json
+import threading
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Canonical skill -> phrasings the model tends to use for it. Canonical names keep
+# the words (e.g. "programming", "system design") the search planner uses to spot
+# technical skills.
+DEFAULT_SYNONYMS = {
+    'Java programming': ['java', 'core java', 'java concepts', 'java fundamentals', 'java basics'],
+    'Python programming': ['python', 'python fundamentals', 'python basics', 'python concepts'],
+    'JavaScript programming': ['javascript', 'js', 'ecmascript', 'javascript fundamentals'],
+    'C++ programming': ['c++', 'cpp', 'modern c++'],
+    'SQL programming': ['sql', 'sql queries', 'databases', 'database queries', 'dbms'],
+    'Object-oriented programming': ['oop', 'oops', 'object oriented design', 'ood', 'low level design', 'lld'],
+    'System design': ['systems design', 'distributed systems design', 'high level design', 'hld',
+                      'scalable system design', 'software architecture'],
+    'Data structures and algorithms': ['dsa', 'data structures', 'algorithms', 'algorithmic problem solving',
+                                       'data structure and algorithm'],
+    'Communication': ['communication skills', 'verbal communication', 'articulation', 'clarity of communication',
+                      'explaining thought process'],
+    'Confidence': ['self confidence', 'composure', 'nervousness', 'poise'],
+    'Decision-making': ['decision making', 'judgment', 'judgement'],
+    'Problem solving': ['problem-solving', 'analytical thinking', 'analytical skills'],
+    'Time management': ['time management', 'pacing', 'managing time'],
+    'Teamwork': ['collaboration', 'team work', 'working in a team'],
+    'Leadership': ['leading teams', 'ownership', 'people management'],
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+# Words that qualify a skill without changing which skill it is
+FILLER_WORDS = frozenset([
+    'a', 'an', 'and', 'the', 'of', 'in', 'on', 'for', 'with', 'your', 'skill', 'skills', 'concept', 'concepts',
+    'fundamental', 'fundamentals', 'basic', 'basics', 'core', 'knowledge', 'understanding', 'proficiency',
+    'programming', 'language', 'ability', 'abilities', 'general', 'overall',
+])
+
+
+def normalize_skill(text: str) -> str:
+    """Lowercase a skill and reduce punctuation and whitespace to single spaces."""
+    return ' '.join(TOKEN_PATTERN.findall((text or '').lower()))
+
+
+def _content_tokens(normalized: str) -> Tuple[str, ...]:
+    return tuple(sorted(set(token for token in normalized.split() if token not in FILLER_WORDS)))
+
+
+def _token_set_similarity(left: Tuple[str, ...], right: Tuple[str, ...]) -> float:
+    """Jaccard similarity of two token sets, counting near-identical tokens (typos) as shared."""
+    if not left or not right:
+        return 0.0
+    shared = 0
+    for token in left:
+        if token in right or any(SequenceMatcher(None, token, other).ratio() >= 0.85 for other in right):
+            shared += 1
+    return shared / (len(left) + len(right) - shared)
+
+
+class SkillCanonicalizer:
+    """Fold free-form skill names onto a fixed set of canonical skills.
+
+    A skill is normalized (case, whitespace and punctuation), then looked up
+    among the canonical names and their synonyms, first exactly, then by its
+    content words, and finally by token-set similarity. Skills that match
+    nothing are returned with normalized whitespace so exact repeats still fold.
+
+    Args:
+        synonyms: Mapping of canonical skill to its synonyms
+        threshold: Minimum token-set similarity for a fuzzy match
+    """
+
+    def __init__(self, synonyms: Optional[Dict[str, List[str]]] = None, threshold: float = 0.6):
+        self.threshold = threshold
+        self._exact = {}
+        self._by_tokens = {}
+        self._candidates = []
+        self._lock = threading.Lock()
+        self._counts = {'exact': 0, 'fuzzy': 0, 'unmatched': 0}
+        for canonical, aliases in (synonyms if synonyms is not None else DEFAULT_SYNONYMS).items():
+            self.add(canonical, aliases)
+        self.canonicalize = lru_cache(maxsize=4096)(self._canonicalize)
+
+    def add(self, canonical: str, aliases: Iterable[str] = ()) -> None:
+        """Register a canonical skill and its synonyms."""
+        for phrase in [canonical, *aliases]:
+            normalized = normalize_skill(phrase)
+            if not normalized:
+                continue
+            self._exact.setdefault(normalized, canonical)
+            tokens = _content_tokens(normalized)
+            if tokens:
+                self._by_tokens.setdefault(tokens, canonical)
+                self._candidates.append((tokens, canonical))
+        if hasattr(self, 'canonicalize'):
+            self.canonicalize.cache_clear()
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def _canonicalize(self, skill: str) -> str:
+        normalized = normalize_skill(skill)
+        if not normalized:
+            return skill.strip()
+
+        canonical = self._exact.get(normalized)
+        tokens = _content_tokens(normalized)
+        if canonical is None and tokens:
+            canonical = self._by_tokens.get(tokens)
+        if canonical is not None:
+            self._count('exact')
+            return canonical
+
+        best, best_score = None, 0.0
+        for candidate_tokens, candidate in self._candidates:
+            score = _token_set_similarity(tokens, candidate_tokens)
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is not None and best_score >= self.threshold:
+            self._count('fuzzy')
+            return best
+
+        self._count('unmatched')
+        return ' '.join(skill.split())
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many lookups matched exactly, fuzzily, or not at all (excluding cached repeats)."""
+        with self._lock:
+            return dict(self._counts)
+
+
+def load_synonyms(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Return the default synonym table merged with a JSON file of {canonical: [synonyms]}."""
+    synonyms = {canonical: list(aliases) for canonical, aliases in DEFAULT_SYNONYMS.items()}
+    if not path:
+        return synonyms
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            extra = json.load(f)
+        for canonical, aliases in extra.items():
+            synonyms.setdefault(canonical, []).extend(aliases)
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"Warning: Failed to load skill synonyms from {path}: {e}")
+    return synonyms
@@ -0,0 +1,7 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep quota counts in memory so test searches never charge a ledger on disk
+os.environ.setdefault('QUOTA_LEDGER_PATH', '')
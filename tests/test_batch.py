@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+
+import main
+
+VIDEOS = [('Video', 'https://www.youtube.com/watch?v=abc')]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    def extract_batch(report_texts, max_workers=None, return_exceptions=False):
+        return [['Communication'] for _ in report_texts]
+
+    async def extract_batch_async(report_texts, max_workers=None, return_exceptions=False):
+        return extract_batch(report_texts)
+
+    async def search_async(query, max_results=None, is_technical=False):
+        return list(VIDEOS)
+
+    monkeypatch.setattr(main, 'ENRICH_RESULTS', False)
+    monkeypatch.setattr(main, 'extract_weak_areas_batch', extract_batch)
+    monkeypatch.setattr(main, 'extract_weak_areas_batch_async', extract_batch_async)
+    monkeypatch.setattr(main, 'search_youtube_videos', lambda query, max_results=None, is_technical=False: list(VIDEOS))
+    monkeypatch.setattr(main, 'search_youtube_videos_async', search_async)
+
+
+def test_invalid_reports_fail_alone(pipeline):
+    results = main.generate_batch_recommendations(['report', 5, '   ', None])
+
+    assert results[0]['status'] == 'success'
+    assert 'Communication' in results[0]['recommendations']
+    assert [result['status'] for result in results[1:]] == ['error'] * 3
+    assert results[1]['message'] == 'Report text must be a string'
+    assert results[2]['message'] == 'Report text cannot be empty'
+
+
+def test_invalid_reports_fail_alone_async(pipeline):
+    results = asyncio.run(main.generate_batch_recommendations_async(['report', 5]))
+
+    assert results[0]['status'] == 'success'
+    assert results[1] == {'status': 'error', 'message': 'Report text must be a string'}
+
+
+def test_batch_endpoint_reports_non_string_items_per_report(pipeline):
+    client = main.create_app().test_client()
+
+    response = client.post('/api/recommendations/batch', json={'reports': ['report', 5]})
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert results[0]['status'] == 'success'
+    assert results[1]['status'] == 'error'
+    assert results[1]['index'] == 1
+
+
+def test_run_batch_records_why_a_file_could_not_be_read(pipeline, tmp_path):
+    report = tmp_path / 'report.txt'
+    report.write_text('report', encoding='utf-8')
+    output = tmp_path / 'results.jsonl'
+
+    counts = main.run_batch([str(report), str(tmp_path / 'missing.txt')], str(output))
+
+    records = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert counts == {'processed': 1, 'skipped': 0, 'failed': 1}
+    assert records[0]['status'] == 'success'
+    assert records[1]['status'] == 'error'
+    assert records[1]['message'].startswith('Failed to read report file: ')
+    assert 'No such file' in records[1]['message']
@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cache import InFlightTimeout, SingleFlight, SQLiteCache, TTLCache
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(max_entries=2, ttl=0.05)
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    time.sleep(0.06)
+    assert cache.get('a') is None
+
+
+def test_sqlite_cache_hit_touches_accessed_at_at_most_once_per_interval(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite3'), 'test', ttl=60)
+    cache.set('key', 'value')
+
+    def accessed_at():
+        return cache._connect().execute("SELECT accessed_at FROM cache_entries WHERE key = 'key'").fetchone()[0]
+
+    stored = accessed_at()
+    assert cache.get('key') == 'value'
+    assert accessed_at() == stored
+
+    with cache._connect() as conn:
+        conn.execute("UPDATE cache_entries SET accessed_at = accessed_at - ?", (cache.TOUCH_INTERVAL,))
+    assert cache.get('key') == 'value'
+    assert accessed_at() >= stored
+
+
+def test_single_flight_shares_result_between_threads():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return 'result'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('key', fetch))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['result'] * 4
+    assert len(calls) == 1
+
+
+def test_single_flight_shares_exception_between_threads():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(1)
+        raise ValueError('upstream failed')
+
+    errors = []
+
+    def call():
+        try:
+            flight.do('key', fetch)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    # The next call starts over instead of reusing the failure
+    assert flight.do('key', lambda: 'ok') == 'ok'
+
+
+def test_single_flight_async_shares_result():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def run():
+        return await asyncio.gather(*[flight.do_async('key', fetch) for _ in range(3)])
+
+    assert asyncio.run(run()) == ['result'] * 3
+    assert len(calls) == 1
+
+
+def test_single_flight_async_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.1)
+        return 'result'
+
+    async def run():
+        first = asyncio.ensure_future(flight.do_async('key', fetch))
+        second = asyncio.ensure_future(flight.do_async('key', fetch))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == 'result'
+
+
+def test_single_flight_async_shares_exception():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        raise ValueError('upstream failed')
+
+    async def run():
+        return await asyncio.gather(*[flight.do_async('key', fetch) for _ in range(2)], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_single_flight_follower_stops_waiting_after_wait_timeout():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=('key', lambda: release.wait(1)))
+    leader.start()
+    time.sleep(0.02)
+
+    started = time.monotonic()
+    with pytest.raises(InFlightTimeout):
+        flight.do('key', lambda: 'unused', wait_timeout=0.05)
+    assert time.monotonic() - started < 0.5
+
+    release.set()
+    leader.join()
+
+
+def test_single_flight_async_follower_stops_waiting_after_wait_timeout():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.2)
+        return 'result'
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do_async('key', fetch))
+        await asyncio.sleep(0.01)
+        with pytest.raises(InFlightTimeout):
+            await flight.do_async('key', fetch, wait_timeout=0.05)
+        # The shared call keeps running for the caller still waiting
+        return await leader
+
+    assert asyncio.run(run()) == 'result'
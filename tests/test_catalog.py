@@ -0,0 +1,66 @@
+import main
+from catalog import VideoCatalog, tokenize
+
+
+def make_catalog():
+    catalog = VideoCatalog()
+    catalog.add({'id': 'java1', 'title': 'Java collections tutorial', 'description': 'Lists, maps and sets in Java'})
+    catalog.add({'id': 'java2', 'title': 'Java streams part 2', 'description': 'Stream API examples'})
+    catalog.add({'id': 'comm1', 'title': 'Communication skills for interviews', 'description': 'Speak clearly',
+                 'tags': ['soft skills']})
+    catalog.add({'id': 'cpp1', 'title': 'Modern C++ in one hour', 'description': 'Smart pointers'})
+    return catalog
+
+
+def test_tokenize_keeps_language_names_and_drops_stopwords():
+    assert tokenize('The C++ and C# guide for you') == ['c++', 'c#', 'guide']
+
+
+def test_add_rejects_invalid_and_duplicate_records():
+    catalog = make_catalog()
+
+    assert not catalog.add({'id': 'java1', 'title': 'Duplicate'})
+    assert not catalog.add({'id': '', 'title': 'No id'})
+    assert not catalog.add({'id': 'x', 'title': ''})
+    assert len(catalog) == 4
+
+
+def test_search_ranks_title_matches_first():
+    items = make_catalog().search('java collections', limit=2)
+
+    assert items[0]['id']['videoId'] == 'java1'
+    assert items[0]['snippet']['title'] == 'Java collections tutorial'
+
+
+def test_search_requires_rare_terms_to_match():
+    assert make_catalog().search('kubernetes java', min_match=0.6) == []
+
+
+def test_search_accept_filter_walks_past_rejected_items():
+    items = make_catalog().search('java', limit=1, accept=lambda item: 'part' not in item['snippet']['title'].lower())
+
+    assert [item['id']['videoId'] for item in items] == ['java1']
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'catalog.json.gz')
+    catalog = make_catalog()
+    catalog.save(path)
+
+    loaded = VideoCatalog.load(path)
+
+    assert len(loaded) == len(catalog)
+    assert loaded.get('cpp1')['title'] == 'Modern C++ in one hour'
+    assert loaded.search('c++', limit=1)[0]['id']['videoId'] == 'cpp1'
+
+
+def test_planner_query_finds_videos_for_the_bare_skill(monkeypatch):
+    catalog = VideoCatalog()
+    for i in range(50):
+        catalog.add({'id': f"java{i}", 'title': f"Java programming tutorial {i}",
+                     'description': 'Code examples for beginners'})
+    monkeypatch.setattr(main, 'get_catalog', lambda: catalog)
+
+    for query in ('Java programming interview preparation', 'java programming interview preparation tutorial'):
+        assert len(main._search_catalog(query, 5, is_technical=True)) == 5
+    assert main._search_catalog('Kubernetes interview preparation', 5, is_technical=True) == []
@@ -0,0 +1,417 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import main
+from cache import SingleFlight, TTLCache
+
+
+class FakeResponse:
+    def __init__(self, query):
+        self.query = query
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'items': [
+            {'id': {'videoId': f"{abs(hash(self.query)) % 10000}-{i}"},
+             'snippet': {'title': f"Video {i}", 'description': 'code example'}}
+            for i in range(10)
+        ]}
+
+
+class SlowYouTube:
+    """Async stand-in for the YouTube search endpoint, optionally ignoring timeouts like a hung upstream."""
+
+    def __init__(self, delay, honour_timeout=True):
+        self.delay = delay
+        self.honour_timeout = honour_timeout
+        # Queries containing one of these words take 5 seconds
+        self.slow_words = ()
+        self.calls = 0
+
+    async def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        query = params['q']
+        delay = 5 if any(word in query.lower() for word in self.slow_words) else self.delay
+        if self.honour_timeout and timeout is not None and timeout < delay:
+            await asyncio.sleep(timeout)
+            raise TimeoutError('timed out')
+        await asyncio.sleep(delay)
+        return FakeResponse(query)
+
+
+@pytest.fixture
+def youtube(monkeypatch):
+    fake = SlowYouTube(delay=0.3)
+
+    async def extract(report_text):
+        return ['Communication']
+
+    monkeypatch.setattr(main, 'YOUTUBE_API_KEY', 'test-key')
+    monkeypatch.setattr(main, 'SEARCH_BACKEND', 'youtube')
+    monkeypatch.setattr(main, 'SKILL_TABLE', False)
+    monkeypatch.setattr(main, 'search_cache', TTLCache(max_entries=100, ttl=60))
+    monkeypatch.setattr(main, 'search_inflight', SingleFlight())
+    monkeypatch.setattr(main, '_get_async_http', lambda: fake)
+    monkeypatch.setattr(main, 'extract_weak_areas_async', extract)
+    return fake
+
+
+def test_request_deadline_ms_caps_client_value(monkeypatch):
+    monkeypatch.setattr(main, 'REQUEST_DEADLINE_MS', 1000)
+    assert main.request_deadline_ms('200', None) == 200
+    assert main.request_deadline_ms(None, 5000) == 1000
+    assert main.request_deadline_ms('invalid', None) == 1000
+    monkeypatch.setattr(main, 'REQUEST_DEADLINE_MS', 0)
+    assert main.request_deadline_ms() is None
+
+
+def test_deadline_returns_partial_results(youtube):
+    recommendations = asyncio.run(main.generate_video_recommendations_async('report', deadline_ms=100))
+    assert recommendations.partial
+    assert 'Communication' in recommendations.pending
+    assert 'Communication' not in recommendations
+
+
+def test_deadline_of_one_request_does_not_fail_a_coalesced_one(youtube):
+    youtube.honour_timeout = False
+
+    async def run():
+        return await asyncio.gather(
+            main.generate_video_recommendations_async('report', deadline_ms=100),
+            main.generate_video_recommendations_async('report'),
+        )
+
+    short, full = asyncio.run(run())
+    assert short.partial
+    assert not full.partial
+    assert 'Communication' in full
+
+
+def test_coalesced_request_retries_after_anothers_deadline(youtube):
+    async def run():
+        return await asyncio.gather(
+            main.generate_video_recommendations_async('report', deadline_ms=100),
+            main.generate_video_recommendations_async('report', deadline_ms=20000),
+        )
+
+    short, full = asyncio.run(run())
+    assert short.partial
+    assert not full.partial
+    assert 'Communication' in full
+
+
+class FakeRequest:
+    def __init__(self, params):
+        self.params = params
+
+
+class FakeSearch:
+    def list(self, **params):
+        return FakeRequest(params)
+
+
+class FakeService:
+    def search(self):
+        return FakeSearch()
+
+
+class SlowPool:
+    """Stand-in for YouTubeClientPool whose requests take delay seconds unless the timeout is shorter."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def execute(self, request, timeout=None):
+        if timeout is not None and timeout < self.delay:
+            time.sleep(timeout)
+            raise TimeoutError('timed out')
+        time.sleep(self.delay)
+        return FakeResponse(request.params['q']).json()
+
+
+def test_sync_coalesced_request_retries_after_anothers_deadline(monkeypatch):
+    pool = SlowPool(delay=0.3)
+    monkeypatch.setattr(main, 'YOUTUBE_API_KEY', 'test-key')
+    monkeypatch.setattr(main, 'SEARCH_BACKEND', 'youtube')
+    monkeypatch.setattr(main, 'SKILL_TABLE', False)
+    monkeypatch.setattr(main, 'search_cache', TTLCache(max_entries=100, ttl=60))
+    monkeypatch.setattr(main, 'search_inflight', SingleFlight())
+    monkeypatch.setattr(main, 'get_youtube_service', lambda: FakeService())
+    monkeypatch.setattr(main, 'get_youtube_pool', lambda: pool)
+    monkeypatch.setattr(main, 'extract_weak_areas', lambda report_text: ['Communication'])
+
+    results = {}
+
+    def request(name, deadline_ms):
+        results[name] = main.generate_video_recommendations('report', deadline_ms=deadline_ms)
+
+    short = threading.Thread(target=request, args=('short', 100))
+    full = threading.Thread(target=request, args=('full', 20000))
+    short.start()
+    time.sleep(0.02)
+    full.start()
+    short.join()
+    full.join()
+
+    assert results['short'].partial
+    assert not results['full'].partial
+    assert 'Communication' in results['full']
+
+
+def test_stream_ends_with_pending_skills_at_deadline(youtube, monkeypatch):
+    async def extract(report_text):
+        return ['Communication', 'Confidence']
+
+    monkeypatch.setattr(main, 'extract_weak_areas_async', extract)
+    youtube.delay = 0.05
+    youtube.slow_words = ('confidence',)
+
+    async def run():
+        return [event async for event in main.aiter_video_recommendations('report', deadline_ms=300)]
+
+    events = asyncio.run(run())
+    done = events[-1]
+    assert done['event'] == 'done'
+    assert done['partial']
+    assert done['pending'] == ['Confidence']
+    assert 'Communication' in [event['skill'] for event in events if event['event'] == 'skill']
+
+
+def test_sync_stream_ends_with_pending_skills_at_deadline(monkeypatch):
+    class SelectivePool:
+        def execute(self, request, timeout=None):
+            delay = 5 if 'confidence' in request.params['q'].lower() else 0.05
+            if timeout is not None and timeout < delay:
+                time.sleep(timeout)
+                raise TimeoutError('timed out')
+            time.sleep(delay)
+            return FakeResponse(request.params['q']).json()
+
+    monkeypatch.setattr(main, 'YOUTUBE_API_KEY', 'test-key')
+    monkeypatch.setattr(main, 'SEARCH_BACKEND', 'youtube')
+    monkeypatch.setattr(main, 'SKILL_TABLE', False)
+    monkeypatch.setattr(main, 'search_cache', TTLCache(max_entries=100, ttl=60))
+    monkeypatch.setattr(main, 'search_inflight', SingleFlight())
+    monkeypatch.setattr(main, 'get_youtube_service', lambda: FakeService())
+    monkeypatch.setattr(main, 'get_youtube_pool', lambda: SelectivePool())
+    monkeypatch.setattr(main, 'extract_weak_areas', lambda report_text: ['Communication', 'Confidence'])
+
+    started = time.monotonic()
+    events = list(main.iter_video_recommendations('report', deadline_ms=300))
+
+    assert time.monotonic() - started < 1
+    assert events[-1]['partial']
+    assert events[-1]['pending'] == ['Confidence']
+
+
+class FakeCompletion:
+    def __init__(self, content):
+        message = type('Message', (), {'content': content})()
+        self.choices = [type('Choice', (), {'message': message})()]
+
+
+def test_sync_coalesced_extraction_waits_only_until_own_deadline(monkeypatch):
+    def slow_completion(request_kwargs):
+        time.sleep(1.5)
+        return FakeCompletion('{"technical_skills": ["Python"], "soft_skills": []}')
+
+    monkeypatch.setattr(main, 'EXTRACTION_MODE', 'llm')
+    monkeypatch.setattr(main, 'SEMANTIC_CACHE', False)
+    monkeypatch.setattr(main, 'llm_cache', TTLCache(max_entries=100, ttl=60))
+    monkeypatch.setattr(main, 'llm_inflight', SingleFlight())
+    monkeypatch.setattr(main, '_create_chat_completion', slow_completion)
+    monkeypatch.setattr(main, 'search_youtube_videos', lambda query, max_results=None, is_technical=False: [])
+
+    leader = threading.Thread(target=main.generate_video_recommendations, args=('report',),
+                              kwargs={'deadline_ms': 10000})
+    leader.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    recommendations = main.generate_video_recommendations('report', deadline_ms=300)
+    elapsed = time.monotonic() - started
+    leader.join()
+
+    assert elapsed < 0.8
+    assert recommendations.partial
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__('rate limited')
+        self.response = type('Response', (), {'headers': {'retry-after': retry_after} if retry_after else {}})()
+
+
+class FlakyClient:
+    """OpenAI client stand-in whose first `failures` completions raise the given error."""
+
+    max_retries = 2
+
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+        self.chat = type('Chat', (), {'completions': self})()
+
+    def with_options(self, **options):
+        assert options['max_retries'] == 0
+        return self
+
+    def create(self, **request_kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return FakeCompletion('{}')
+
+
+def test_completion_retries_rate_limits_within_deadline():
+    client = FlakyClient(failures=2, error=RateLimited())
+
+    with main._deadline_scope(5000):
+        response = main._complete(client, {})
+
+    assert client.calls == 3
+    assert response.choices[0].message.content == '{}'
+
+
+def test_completion_does_not_retry_past_deadline():
+    client = FlakyClient(failures=1, error=RateLimited(retry_after='10'))
+
+    started = time.monotonic()
+    with main._deadline_scope(1000):
+        with pytest.raises(RateLimited):
+            main._complete(client, {})
+
+    assert client.calls == 1
+    assert time.monotonic() - started < 0.5
+
+
+class FakeChunk:
+    def __init__(self, content):
+        delta = type('Delta', (), {'content': content})()
+        self.choices = [type('Choice', (), {'delta': delta})()]
+
+
+class TricklingStream:
+    """Chat completion stream that sends one chunk every interval seconds."""
+
+    def __init__(self, pieces, interval):
+        self.pieces = pieces
+        self.interval = interval
+        self.closed = False
+
+    def __iter__(self):
+        for piece in self.pieces:
+            if self.closed:
+                return
+            time.sleep(self.interval)
+            yield FakeChunk(piece)
+
+    async def __aiter__(self):
+        for piece in self.pieces:
+            if self.closed:
+                return
+            await asyncio.sleep(self.interval)
+            yield FakeChunk(piece)
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.closed = True
+
+
+TRICKLED_COMPLETION = ['{"technical_skills": ["Python"', ', "SQL"'] + [' '] * 30 + [']}']
+
+
+@pytest.fixture
+def streamed_extraction(monkeypatch):
+    searched = []
+    monkeypatch.setattr(main, 'EXTRACTION_MODE', 'llm')
+    monkeypatch.setattr(main, 'SEMANTIC_CACHE', False)
+    monkeypatch.setattr(main, 'llm_cache', TTLCache(max_entries=100, ttl=60))
+
+    def search(query, max_results=None, is_technical=False):
+        searched.append(query)
+        return [('Video', f"https://www.youtube.com/watch?v={len(searched)}")]
+
+    async def search_async(query, max_results=None, is_technical=False):
+        return search(query, max_results, is_technical)
+
+    monkeypatch.setattr(main, 'search_youtube_videos', search)
+    monkeypatch.setattr(main, 'search_youtube_videos_async', search_async)
+    return searched
+
+
+def test_streamed_extraction_stops_at_deadline_between_chunks(streamed_extraction, monkeypatch):
+    stream = TricklingStream(TRICKLED_COMPLETION, interval=0.05)
+    monkeypatch.setattr(main, '_create_chat_completion', lambda request_kwargs: stream)
+
+    started = time.monotonic()
+    recommendations = main.generate_video_recommendations('report', deadline_ms=500, stream_extraction=True)
+
+    assert time.monotonic() - started < 1.0
+    assert stream.closed
+    assert recommendations.partial
+    assert 'Python programming (Technical)' in recommendations
+
+
+def test_async_streamed_extraction_stops_at_deadline_between_chunks(streamed_extraction, monkeypatch):
+    stream = TricklingStream(TRICKLED_COMPLETION, interval=0.05)
+    stream.close = stream.aclose
+
+    async def create(request_kwargs):
+        return stream
+
+    monkeypatch.setattr(main, '_create_chat_completion_async', create)
+
+    started = time.monotonic()
+    recommendations = asyncio.run(
+        main.generate_video_recommendations_async('report', deadline_ms=500, stream_extraction=True)
+    )
+
+    assert time.monotonic() - started < 1.0
+    assert stream.closed
+    assert recommendations.partial
+    assert 'Python programming (Technical)' in recommendations
+
+
+class PagedPool:
+    """Stand-in for YouTubeClientPool with a fast first page and a slow second page."""
+
+    def execute(self, request, timeout=None):
+        if not request.params.get('pageToken'):
+            return {'items': FakeResponse('page1').json()['items'][:1], 'nextPageToken': 'page2'}
+        if timeout is not None and timeout < 0.5:
+            time.sleep(timeout)
+            raise TimeoutError('timed out')
+        time.sleep(0.5)
+        return FakeResponse('page2').json()
+
+
+def test_search_cut_short_by_deadline_is_not_cached(monkeypatch):
+    monkeypatch.setattr(main, 'YOUTUBE_API_KEY', 'test-key')
+    monkeypatch.setattr(main, 'SEARCH_BACKEND', 'youtube')
+    monkeypatch.setattr(main, 'SKILL_TABLE', False)
+    monkeypatch.setattr(main, 'search_cache', TTLCache(max_entries=100, ttl=60))
+    monkeypatch.setattr(main, 'search_inflight', SingleFlight())
+    monkeypatch.setattr(main, 'get_youtube_service', lambda: FakeService())
+    monkeypatch.setattr(main, 'get_youtube_pool', lambda: PagedPool())
+    monkeypatch.setattr(main, 'acceptance_tracker', main._AcceptanceTracker())
+
+    with main._deadline_scope(300):
+        short = main.search_youtube_videos('communication skills', max_results=4)
+    assert short.cut_by_deadline
+    assert len(short) == 1
+
+    full = main.search_youtube_videos('communication skills', max_results=4)
+    assert not isinstance(full, main._PartialResults)
+    assert len(full) == 4
+
+    assert main._assemble_recommendations([('Communication', 'communication skills', 4, False)], [short]).partial
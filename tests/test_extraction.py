@@ -0,0 +1,148 @@
+import json
+import os
+
+import pytest
+
+import main
+
+COMPLETION = json.dumps({
+    'summary': 'Needs work on "fundamentals"',
+    'technical_skills': ['Java collections', 'Say \\"hi\\" in C++', 'Café design'],
+    'soft_skills': ['Communication', ''],
+    'notes': ['not a skill'],
+}, ensure_ascii=False)
+
+
+def feed_in_chunks(text, size):
+    parser = main._SkillArrayParser()
+    skills = []
+    for start in range(0, len(text), size):
+        skills.extend(parser.feed(text[start:start + size]))
+    return parser, skills
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, len(COMPLETION)])
+def test_skill_array_parser_is_independent_of_chunking(size):
+    parser, skills = feed_in_chunks(COMPLETION, size)
+
+    assert skills == ['Java collections', 'Say \\"hi\\" in C++', 'Café design', 'Communication']
+    assert parser.text == COMPLETION
+
+
+def test_skill_array_parser_decodes_escapes():
+    raw = '{"technical_skills": ["Say \\"hi\\"", "Back\\\\slash", "Caf\\u00e9", "Tab\\tbed"]}'
+    _, skills = feed_in_chunks(raw, 1)
+
+    assert skills == ['Say "hi"', 'Back\\slash', 'Café', 'Tab\tbed']
+
+
+def test_skill_array_parser_ignores_strings_outside_skill_arrays():
+    raw = ('{"technical_skills_note": ["no"], "soft_skills": [["nested"], {"name": "object"}, "Leadership"],'
+           ' "other": ["technical_skills"], "technical_skills": ["SQL"]}')
+    _, skills = feed_in_chunks(raw, 4)
+
+    assert skills == ['Leadership', 'SQL']
+
+
+def test_skill_array_parser_emits_skills_before_the_object_closes():
+    parser = main._SkillArrayParser()
+
+    assert parser.feed('```json\n{"technical_skills": ["Python", "Dja') == ['Python']
+    assert parser.feed('ngo"') == ['Django']
+    assert parser.feed('], "soft_skills": []}\n```') == []
+
+
+def test_parse_batch_weak_areas_keeps_well_formed_entries():
+    raw = '```json\n' + json.dumps({'reports': [
+        {'id': 'r0', 'technical_skills': ['Python'], 'soft_skills': ['Communication']},
+        {'id': 'r1', 'technical_skills': [], 'soft_skills': ['Confidence']},
+        {'id': 'r2', 'technical_skills': 'SQL', 'soft_skills': []},
+        {'id': 'r9', 'technical_skills': ['Go'], 'soft_skills': []},
+        {'id': 'x3', 'technical_skills': ['Rust'], 'soft_skills': []},
+        'r3',
+    ]}) + '\n```'
+
+    parsed = main._parse_batch_weak_areas(raw, count=4)
+
+    assert parsed == {
+        0: ['Python', 'Communication'],
+        1: ['Technical Interview Skills', 'Confidence'],
+    }
+
+
+@pytest.mark.parametrize('raw', ['not json', '[]', '{"reports": {"id": "r0"}}', '{"other": []}'])
+def test_parse_batch_weak_areas_returns_nothing_for_malformed_output(raw):
+    assert main._parse_batch_weak_areas(raw, count=1) == {}
+
+
+def test_parse_weak_areas_puts_technical_skills_first():
+    raw = '{"technical_skills": ["Python"], "soft_skills": ["Communication"]}'
+
+    assert main._parse_weak_areas(raw) == ['Python', 'Communication']
+
+
+def test_parse_scored_report_ranks_report_txt_dimensions_lowest_first():
+    with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'report.txt'),
+              encoding='utf-8') as f:
+        report_text = f.read()
+
+    assert main.parse_scored_report(report_text) == [
+        'Communication', 'Decision-making', 'Confidence', 'Technical Proficiency', 'Language Fluency',
+    ]
+
+
+def test_parse_scored_report_needs_a_scoring_header():
+    assert main.parse_scored_report('Communication: 1/10\nConfidence: 2/10') is None
+
+
+def test_parse_scored_report_skips_totals_and_zero_maximums():
+    report_text = 'SCORING\n\nSQL: 3/10\nTotal: 4/20\nTeamwork: 0/0\nGit: 1/10\nAnalysis: Teamwork: 1/10\n'
+
+    assert main.parse_scored_report(report_text) == ['Git', 'SQL']
+
+
+def test_parse_scored_report_falls_back_on_a_single_score_line():
+    assert main.parse_scored_report('Scoring:\nCommunication: 1/10\nTotal: 1/10\n') is None
+
+
+def test_parse_scored_report_returns_lowest_dimension_when_none_are_weak():
+    assert main.parse_scored_report('Scoring:\nSQL: 9/10\nGit: 7/10\n') == ['Git']
+
+
+class FakeCompletion:
+    def __init__(self, content):
+        message = type('Message', (), {'content': content})()
+        self.choices = [type('Choice', (), {'message': message})()]
+
+
+def test_batch_group_fails_whole_on_api_error(monkeypatch):
+    calls = []
+
+    def failing_completion(request_kwargs):
+        calls.append(request_kwargs)
+        raise RuntimeError('401 Unauthorized')
+
+    monkeypatch.setattr(main, '_create_chat_completion', failing_completion)
+
+    results = main._extract_batch_group([f"report {i}" for i in range(32)])
+
+    assert len(calls) == 1
+    assert len(results) == 32
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_batch_group_retries_only_missing_reports(monkeypatch):
+    monkeypatch.setattr(main, '_create_chat_completion', lambda request_kwargs: FakeCompletion(
+        '{"reports": [{"id": "r0", "technical_skills": ["Java"], "soft_skills": []}]}'))
+    retried = []
+
+    def extract_one(report_text):
+        retried.append(report_text)
+        return ['SQL']
+
+    monkeypatch.setattr(main, 'extract_weak_areas', extract_one)
+
+    results = main._extract_batch_group(['first', 'second'])
+
+    assert results == [['Java'], ['SQL']]
+    assert retried == ['second']
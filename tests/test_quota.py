@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+from quota import QuotaLedger, QuotaScheduler
+
+
+def test_ledger_counts_survive_a_new_instance(tmp_path):
+    path = str(tmp_path / 'quota.sqlite3')
+    QuotaLedger(10000, path=path).charge('search.list')
+
+    assert QuotaLedger(10000, path=path).spent_today() == 100
+
+
+def test_ledger_counts_in_memory_when_path_cannot_be_opened(tmp_path):
+    ledger = QuotaLedger(10000, path=str(tmp_path / 'missing' / 'quota.sqlite3'))
+    ledger.charge('videos.list', calls=3)
+
+    assert ledger.path is None
+    assert ledger.remaining() == 9997
+
+
+def test_sqlite_ledger_is_charged_and_read_off_the_event_loop(tmp_path):
+    ledger = QuotaLedger(10000, path=str(tmp_path / 'quota.sqlite3'))
+    scheduler = QuotaScheduler(ledger)
+    threads = []
+    charge, remaining = ledger.charge, ledger.remaining
+
+    def record(fn):
+        def wrapper(*args):
+            threads.append(threading.get_ident())
+            return fn(*args)
+        return wrapper
+
+    ledger.charge, ledger.remaining = record(charge), record(remaining)
+
+    async def run():
+        await ledger.charge_async('search.list')
+        return await scheduler.level_async(), threading.get_ident()
+
+    level, loop_thread = asyncio.run(run())
+
+    assert level == 0
+    assert len(threads) == 2
+    assert loop_thread not in threads
+    assert ledger.spent_today() == 100
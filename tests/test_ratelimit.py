@@ -0,0 +1,79 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from ratelimit import RateLimitExceeded, SQLiteTokenBucket, TokenBucket
+
+
+def test_token_bucket_makes_callers_wait_for_capacity():
+    bucket = TokenBucket(rate=20, capacity=1)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_token_bucket_raises_instead_of_waiting_past_timeout():
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.acquire()
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire(timeout=0.1)
+    # The rejected caller's tokens were returned
+    assert bucket._reserve(1, timeout=1.1) <= 1.0
+
+
+def test_disabled_token_bucket_never_waits():
+    bucket = TokenBucket(rate=0)
+    started = time.monotonic()
+    for _ in range(100):
+        bucket.acquire(timeout=0)
+    assert time.monotonic() - started < 0.05
+
+
+def test_sqlite_bucket_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'limits.sqlite3')
+    first = SQLiteTokenBucket(path, 'youtube', rate=1, capacity=1)
+    second = SQLiteTokenBucket(path, 'youtube', rate=1, capacity=1)
+    first.acquire()
+    with pytest.raises(RateLimitExceeded):
+        second.acquire(timeout=0.1)
+
+
+def test_sqlite_acquire_async_does_not_block_event_loop(tmp_path):
+    path = str(tmp_path / 'limits.sqlite3')
+    bucket = SQLiteTokenBucket(path, 'youtube', rate=100)
+    locked = threading.Event()
+
+    def hold_write_lock():
+        # Another worker holding the write lock makes the reservation wait on SQLite's busy timeout
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.execute("BEGIN IMMEDIATE")
+        locked.set()
+        time.sleep(0.3)
+        conn.execute("COMMIT")
+        conn.close()
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        await bucket.acquire_async()
+        ticker.cancel()
+        return ticks
+
+    holder = threading.Thread(target=hold_write_lock)
+    holder.start()
+    locked.wait(1)
+    ticks = asyncio.run(run())
+    holder.join()
+
+    assert ticks >= 10
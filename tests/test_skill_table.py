@@ -0,0 +1,125 @@
+import json
+import time
+
+import main
+from skill_table import SkillTable
+
+KEY = ('communication skills tutorial', False)
+OLD_VIDEOS = [('Old video', 'https://www.youtube.com/watch?v=old')]
+NEW_VIDEOS = [('New video', 'https://www.youtube.com/watch?v=new')]
+
+
+def make_table(tmp_path, resolved):
+    def resolve(query, is_technical):
+        resolved.append((query, is_technical))
+        return NEW_VIDEOS
+
+    return SkillTable(resolve, path=str(tmp_path / 'skill_table.json'), refresh_interval=86400)
+
+
+def test_refresh_resolves_stale_entries_even_after_recent_insertions(tmp_path):
+    resolved = []
+    table = make_table(tmp_path, resolved)
+    table.put(KEY, OLD_VIDEOS, pinned=True)
+    table._refreshed_at = time.time() - 10 * 3600
+    table.save()
+    # An on-demand insertion saves the file again, making it look new
+    table.put(('other', False), OLD_VIDEOS)
+    table.save()
+
+    table.refresh()
+
+    assert KEY in resolved
+    assert table.get(KEY) == NEW_VIDEOS
+
+
+def test_refresh_adopts_table_recently_refreshed_by_another_process(tmp_path):
+    resolved = []
+    table = make_table(tmp_path, resolved)
+    table.put(KEY, OLD_VIDEOS, pinned=True)
+    with open(table.path, 'w', encoding='utf-8') as f:
+        json.dump({'refreshed_at': time.time() - 60,
+                   'entries': [{'key': list(KEY), 'videos': NEW_VIDEOS, 'pinned': True}]}, f)
+
+    table.refresh()
+
+    assert resolved == []
+    assert table.get(KEY) == NEW_VIDEOS
+
+
+def test_refresh_keeps_videos_when_resolve_finds_nothing(tmp_path):
+    table = SkillTable(lambda query, is_technical: [], path=str(tmp_path / 'skill_table.json'))
+    table.put(KEY, OLD_VIDEOS, pinned=True)
+
+    table.refresh()
+
+    assert table.get(KEY) == OLD_VIDEOS
+
+
+def test_unpinned_entries_are_evicted_least_recently_used_first():
+    table = SkillTable(lambda query, is_technical: None, max_entries=2)
+    table.put(('pinned', False), OLD_VIDEOS, pinned=True)
+    for name in ('a', 'b', 'c'):
+        table.put((name, False), OLD_VIDEOS)
+
+    assert table.get(('a', False)) is None
+    assert table.get(('c', False)) == OLD_VIDEOS
+    assert table.get(('pinned', False)) == OLD_VIDEOS
+
+
+def test_refresh_resolves_only_pinned_entries(tmp_path):
+    resolved = []
+    table = make_table(tmp_path, resolved)
+    table.put(KEY, OLD_VIDEOS, pinned=True)
+    for name in ('a', 'b', 'c'):
+        table.put((name, False), OLD_VIDEOS)
+
+    table.refresh()
+
+    assert resolved == [KEY]
+    assert table.get(('a', False)) == OLD_VIDEOS
+
+
+def test_unpinned_entries_expire_after_ttl():
+    table = SkillTable(lambda query, is_technical: None, entry_ttl=60)
+    table.put(KEY, OLD_VIDEOS, pinned=True)
+    table.put(('a', False), OLD_VIDEOS)
+    table._stored_at[KEY] -= 120
+    table._stored_at[('a', False)] -= 120
+
+    assert table.get(('a', False)) is None
+    assert table.get(KEY) == OLD_VIDEOS
+
+
+def test_refresh_budget_resolves_least_recently_resolved_first(tmp_path):
+    resolved = []
+    table = make_table(tmp_path, resolved)
+    table.refresh_budget = lambda: 2
+    for age, name in enumerate(('newest', 'middle', 'oldest')):
+        key = (name, False)
+        table.put(key, OLD_VIDEOS, pinned=True)
+        table._stored_at[key] -= age * 3600
+
+    table.refresh()
+
+    assert resolved == [('oldest', False), ('middle', False)]
+    assert table.get(('newest', False)) == OLD_VIDEOS
+
+
+def test_table_miss_searches_only_as_deep_as_requested(monkeypatch):
+    depths = []
+
+    def search(query, max_results, is_technical=False, refresh=False):
+        depths.append(max_results)
+        return [(f"Video {i}", f"https://www.youtube.com/watch?v={i}") for i in range(max_results)]
+
+    table = SkillTable(lambda query, is_technical: None)
+    monkeypatch.setattr(main, 'SKILL_TABLE', True)
+    monkeypatch.setattr(main, '_skill_table', table)
+    monkeypatch.setattr(main, '_search_backends', search)
+    monkeypatch.setattr(table, 'submit', lambda key, videos: table.put(key, videos))
+
+    assert len(main.search_youtube_videos('Docker', max_results=3)) == 3
+    assert len(main.search_youtube_videos('Docker', max_results=2)) == 2
+    assert len(main.search_youtube_videos('Docker', max_results=5)) == 5
+    assert depths == [3, 5]
@@ -0,0 +1,48 @@
+import json
+
+from skills import SkillCanonicalizer, load_synonyms, normalize_skill
+
+
+def test_normalize_skill_collapses_case_and_punctuation():
+    assert normalize_skill('  Core-Java   Concepts! ') == 'core java concepts'
+
+
+def test_synonyms_and_filler_words_fold_onto_canonical_skill():
+    canonicalizer = SkillCanonicalizer()
+
+    assert canonicalizer.canonicalize('Core Java concepts') == 'Java programming'
+    assert canonicalizer.canonicalize('OOPS') == 'Object-oriented programming'
+    assert canonicalizer.canonicalize('communication skills') == 'Communication'
+
+
+def test_typos_match_fuzzily():
+    canonicalizer = SkillCanonicalizer()
+
+    assert canonicalizer.canonicalize('Systm design') == 'System design'
+    assert canonicalizer.stats()['fuzzy'] == 1
+
+
+def test_unmatched_skills_keep_their_name():
+    canonicalizer = SkillCanonicalizer()
+
+    assert canonicalizer.canonicalize('  Kubernetes   networking ') == 'Kubernetes networking'
+    assert canonicalizer.stats()['unmatched'] == 1
+
+
+def test_added_canonical_skills_are_matched():
+    canonicalizer = SkillCanonicalizer(synonyms={})
+    canonicalizer.canonicalize('k8s')
+    canonicalizer.add('Kubernetes', ['k8s'])
+
+    assert canonicalizer.canonicalize('k8s') == 'Kubernetes'
+
+
+def test_load_synonyms_merges_file_with_defaults(tmp_path):
+    path = tmp_path / 'synonyms.json'
+    path.write_text(json.dumps({'Kubernetes': ['k8s'], 'Java programming': ['jvm']}))
+
+    synonyms = load_synonyms(str(path))
+
+    assert synonyms['Kubernetes'] == ['k8s']
+    assert 'jvm' in synonyms['Java programming']
+    assert 'core java' in synonyms['Java programming']
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+from bench_startup import measure_import
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Generous enough for a slow CI machine; importing main takes well under 100 ms locally
+IMPORT_BUDGET_MS = 1000
+HEAVY_MODULES = ('openai', 'googleapiclient', 'flask')
+
+
+def test_main_imports_within_budget():
+    total_ms, children = measure_import('main')
+
+    assert total_ms < IMPORT_BUDGET_MS
+    assert not {name.split('.')[0] for _, name in children} & set(HEAVY_MODULES)
+
+
+def test_main_does_not_import_clients_at_startup():
+    # measure_import lists direct imports only, so check everything main pulled in
+    check = f"import sys, main; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', check], cwd=REPO_ROOT, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
@@ -0,0 +1,112 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import httplib2
+
+# Errors that mean the connection itself is broken and should not be reused
+TRANSPORT_ERRORS = (OSError, httplib2.HttpLib2Error)
+
+
+def _set_timeout(http: httplib2.Http, timeout: float) -> None:
+    """Change the socket timeout of an Http object and its already open connections."""
+    http.timeout = timeout
+    for conn in http.connections.values():
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+
+
+class YouTubeClientPool:
+    """Bounded pool of keep-alive HTTP connections for executing YouTube API requests.
+
+    httplib2.Http is not thread-safe, so every request runs on a connection
+    checked out of the pool and returned afterwards. Connections are reused
+    (keeping their TCP/TLS sessions alive) until they sit idle for longer than
+    max_idle seconds or fail with a transport error, at which point they are
+    discarded and replaced on demand.
+
+    Args:
+        size: Maximum number of connections, and so of concurrent requests
+        timeout: Socket timeout in seconds for each connection
+        max_idle: Seconds after which an idle connection is dropped instead of reused
+        checkout_timeout: Seconds to wait for a free connection before giving up
+    """
+
+    def __init__(self, size: int = 8, timeout: float = 30.0, max_idle: float = 120.0,
+                 checkout_timeout: float = 30.0):
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.checkout_timeout = checkout_timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._created = 0
+        self._evicted = 0
+
+    def _new_connection(self) -> httplib2.Http:
+        self._created += 1
+        return httplib2.Http(timeout=self.timeout)
+
+    def _checkout(self, checkout_timeout: Optional[float] = None) -> httplib2.Http:
+        if not self._slots.acquire(timeout=self.checkout_timeout if checkout_timeout is None else checkout_timeout):
+            raise RuntimeError("Timed out waiting for a free YouTube API connection")
+
+        now = time.monotonic()
+        with self._lock:
+            # Most recently used first: it is the most likely to still be open
+            while self._idle:
+                http, returned_at = self._idle.pop()
+                if now - returned_at <= self.max_idle:
+                    return http
+                self._evicted += 1
+            return self._new_connection()
+
+    def _checkin(self, http: Optional[httplib2.Http]) -> None:
+        if http is not None:
+            with self._lock:
+                self._idle.append((http, time.monotonic()))
+        self._slots.release()
+
+    @contextmanager
+    def connection(self, checkout_timeout: Optional[float] = None) -> Iterator[httplib2.Http]:
+        """Check out a connection for the duration of the block."""
+        http = self._checkout(checkout_timeout)
+        try:
+            yield http
+        except TRANSPORT_ERRORS:
+            with self._lock:
+                self._evicted += 1
+            http = None
+            raise
+        finally:
+            self._checkin(http)
+
+    def execute(self, request: Any, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Execute a googleapiclient HttpRequest on a pooled connection.
+
+        Args:
+            request: Request to execute
+            timeout: Socket timeout in seconds for this request only, also bounding
+                the wait for a free connection. If None, uses the pool's timeout
+        """
+        checkout_timeout = None if timeout is None else min(self.checkout_timeout, timeout)
+        with self.connection(checkout_timeout) as http:
+            if timeout is None:
+                return request.execute(http=http)
+            _set_timeout(http, timeout)
+            try:
+                return request.execute(http=http)
+            finally:
+                _set_timeout(http, self.timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'created': self._created,
+                'evicted': self._evicted,
+            }